@@ -0,0 +1,66 @@
+"""
+Run the AnimationEngine headless against a mock chroma interface and report achieved FPS.
+
+Each setKeyRow call sleeps for the given latency; once latency exceeds the frame
+budget the engine drops ticks instead of queueing them.
+
+    python benchmarks/bench_animation.py [fps] [latency_ms] [seconds]
+"""
+import sys
+import time
+
+import numpy as np
+
+from razer_control.core.animation import AnimationEngine
+from razer_control.core.matrix import RazerAdvancedFX
+
+
+class MockProxy:
+    def __init__(self, latency):
+        self.latency = latency
+        self.uploads = 0
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        def _call(*args, **kwargs):
+            if member == 'setKeyRow':
+                self.uploads += 1
+                time.sleep(self.latency)
+        return _call
+
+
+def moving_gradient(frame, t):
+    cols = np.arange(frame._cols)
+    frame._matrix[0] = ((cols * 12 + t * 255) % 256).astype(np.uint8)
+    frame._matrix[1] = 255 - frame._matrix[0]
+    frame._matrix[2] = 64
+
+
+def blinking_key(frame, t):
+    frame[(2, 5)] = (255, 0, 0) if int(t * 4) % 2 else (0, 0, 0)
+
+
+def main():
+    fps = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.002
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    for render in (moving_gradient, blinking_key):
+        proxy = MockProxy(latency)
+        advanced = RazerAdvancedFX('MOCK0001', {'lighting_led_matrix': True}, daemon_dbus=proxy, matrix_dims=(6, 22))
+
+        engine = AnimationEngine(advanced, render, fps)
+        engine.start()
+        time.sleep(seconds)
+        engine.stop()
+
+        stats = engine.stats()
+        uploads = advanced.upload_stats()
+        print(f"{render.__name__}: target {stats['target_fps']:.0f} fps, achieved {stats['fps']:.1f} fps, "
+              f"frame time avg {stats['frame_time_avg_ms']:.2f} ms / max {stats['frame_time_max_ms']:.2f} ms, "
+              f"{stats['frames']} frames, {stats['dropped']} dropped")
+        print(f"{'':>{len(render.__name__)}}  {proxy.uploads} uploads, {uploads['skipped_uploads']} skipped, "
+              f"{uploads['bytes_sent']} bytes sent, {uploads['bytes_saved']} bytes saved")
+
+
+if __name__ == '__main__':
+    main()
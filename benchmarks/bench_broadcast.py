@@ -0,0 +1,41 @@
+"""
+Time a brightness broadcast to N mock devices, each with a fixed per-call latency.
+
+Before broadcasting in parallel the total was N round trips; now it is about one.
+One device can be made to hang to show the per-device timeout report.
+
+    PYTHONPATH=. python benchmarks/bench_broadcast.py [devices] [latency_ms] [--hang]
+
+Exits with 1 if the broadcast reached no device at all.
+"""
+import sys
+import time
+
+from tests.mock_daemon import MockDaemon, install_stand_ins
+
+install_stand_ins()  # before any core import, in case dbus/openrazer are missing
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    count = int(args[0]) if args else 4
+    latency = float(args[1]) / 1000 if len(args) > 1 else 0.02
+
+    daemon = MockDaemon(devices=count, latency=latency)
+    manager = daemon.manager(watch_hotplug=False)
+    if '--hang' in sys.argv and daemon.devices:
+        daemon.devices[-1].latency = 5.0  # only after the scan, which would hang too
+
+    start = time.perf_counter()
+    report = manager.set_brightness(50, device_serial=None)
+    elapsed = time.perf_counter() - start
+
+    print(f"{count} devices, {latency * 1000:.1f} ms per call")
+    print(f"sequential would take ~{count * latency * 1000:.1f} ms, broadcast took {elapsed * 1000:.1f} ms")
+    print(f"report: {report}")
+    manager.executor.shutdown(wait=False)
+    return 0 if report else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
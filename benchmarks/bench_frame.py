@@ -0,0 +1,46 @@
+"""
+Frame serialization: the old per-row join against the preallocated wire buffer.
+
+    python benchmarks/bench_frame.py [iterations]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from razer_control.core.matrix import Frame
+
+SIZES = {
+    'keyboard 6x22': (6, 22),
+    'keyboard 9x24': (9, 24),
+    'large 64x64': (64, 64),
+    'max 255x255': (255, 255),
+}
+
+
+def legacy_bytes(frame):
+    """Serialization as it was before the wire buffer, kept as the reference."""
+    def row_binary(row_id):
+        return (row_id.to_bytes(1, byteorder='big') + (0).to_bytes(1, byteorder='big')
+                + (frame._cols - 1).to_bytes(1, byteorder='big') + frame._matrix[:, row_id].tobytes(order='F'))
+    return b''.join([row_binary(row_id) for row_id in range(0, frame._rows)])
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+
+    for label, dims in SIZES.items():
+        frame = Frame(dims)
+        frame._matrix[...] = rng.integers(0, 256, frame._matrix.shape, dtype=np.uint8)
+        assert bytes(frame) == legacy_bytes(frame), label
+
+        legacy = timeit.timeit(lambda: legacy_bytes(frame), number=iterations) / iterations
+        copy = timeit.timeit(lambda: bytes(frame), number=iterations) / iterations
+        view = timeit.timeit(frame.wire_buffer, number=iterations) / iterations
+        print(f"{label:>14}: legacy {legacy * 1e6:8.1f} us | bytes() {copy * 1e6:8.1f} us "
+              f"| wire_buffer() {view * 1e6:8.1f} us | {legacy / view:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
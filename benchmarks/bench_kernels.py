@@ -0,0 +1,49 @@
+"""
+Time every kernel in razer_control.core.kernels against the 60 FPS frame budget.
+
+    python benchmarks/bench_kernels.py [iterations]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from razer_control.core import kernels
+from razer_control.core.matrix import Frame
+
+BUDGET_MS = 1000 / 60
+SIZES = {'full-size keyboard 6x22': (6, 22), 'large 32x64': (32, 64)}
+
+
+def cases(frame, rng):
+    return {
+        'fill': lambda: kernels.fill(frame, (255, 0, 0)),
+        'gradient': lambda: kernels.gradient(frame, (255, 0, 0), (0, 0, 255)),
+        'wave': lambda: kernels.wave(frame, 0.25, (0, 255, 0)),
+        'ripple': lambda: kernels.ripple(frame, 0.2, (2, 10), (0, 128, 255)),
+        'starlight': lambda: kernels.starlight(frame, (255, 255, 255), rng=rng),
+        'fade': lambda: kernels.fade(frame, 0.9),
+        'hue_rotate': lambda: kernels.hue_rotate(frame, 15),
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    worst = 0.0
+
+    for label, dims in SIZES.items():
+        frame = Frame(dims)
+        kernels.gradient(frame, (255, 0, 0), (0, 0, 255))
+        print(label)
+        for name, kernel in cases(frame, rng).items():
+            ms = timeit.timeit(kernel, number=iterations) / iterations * 1000
+            worst = max(worst, ms)
+            print(f"  {name:>10}: {ms * 1000:8.1f} us  ({ms / BUDGET_MS * 100:5.2f}% of a 60 FPS frame)")
+
+    print(f"worst kernel: {worst:.3f} ms of {BUDGET_MS:.1f} ms budget")
+    return 0 if worst < BUDGET_MS else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Count D-Bus proxies/interfaces and memory when enumerating N devices, with and without the shared pool.
+
+    python benchmarks/bench_proxy_pool.py [devices]
+"""
+import sys
+import tracemalloc
+
+import dbus as _dbus
+
+from razer_control.core import fx as fx_module
+from razer_control.core.dbus_pool import DBusPool
+from razer_control.core.fx import RazerFX
+
+CAPABILITIES = {
+    'lighting_static': True, 'lighting_logo': True, 'lighting_scroll': True,
+    'lighting_left': True, 'lighting_right': True, 'lighting_backlight': True,
+}
+
+
+class MockProxy:
+    def __init__(self, object_path):
+        self.object_path = object_path
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        return lambda *args, **kwargs: None
+
+
+class MockBus:
+    def __init__(self):
+        self.get_object_calls = 0
+
+    def get_object(self, bus_name, object_path):
+        self.get_object_calls += 1
+        return MockProxy(object_path)
+
+
+class UnsharedPool(DBusPool):
+    """Behaves like the code before the pool: every lookup creates a new object."""
+
+    def get_object(self, bus_name, object_path):
+        self.misses += 1
+        return self.bus.get_object(bus_name, object_path)
+
+    def get_interface(self, proxy, interface):
+        self.misses += 1
+        return _dbus.Interface(proxy, interface)
+
+
+def enumerate_devices(pool, count):
+    fx_module._pool = pool
+    tracemalloc.start()
+    devices = [RazerFX(f"MOCK{i:04d}", CAPABILITIES) for i in range(count)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return devices, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+
+    # No recorder on either side: TimedInterface wrappers would only count against the pool
+    for label, pool in (('unshared', UnsharedPool(MockBus, recorder=None)), ('pooled', DBusPool(MockBus, recorder=None))):
+        _, peak = enumerate_devices(pool, count)
+        # A second pass models a rescan, which reuses everything the pool already holds.
+        _, rescan_peak = enumerate_devices(pool, count)
+        print(f"{label:>8}: {pool.misses} proxies/interfaces created, "
+              f"{pool.bus.get_object_calls} get_object calls, "
+              f"peak {peak / 1024:.1f} KiB (rescan {rescan_peak / 1024:.1f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
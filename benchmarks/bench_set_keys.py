@@ -0,0 +1,61 @@
+"""
+Paint N keys one setKey call at a time versus one RazerAdvancedFX.set_keys batch.
+
+Every mock D-Bus call costs the given latency, so the result is dominated by round trips.
+
+    python benchmarks/bench_set_keys.py [keys] [latency_ms]
+"""
+import sys
+import time
+
+import numpy as np
+
+from razer_control.core.matrix import RazerAdvancedFX
+
+DIMS = (6, 22)
+
+
+class MockProxy:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.bytes = 0
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        def _call(*args, **kwargs):
+            self.calls += 1
+            if member == 'setKeyRow':
+                self.bytes += len(args[0])
+            time.sleep(self.latency)
+        return _call
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.001
+
+    rng = np.random.default_rng(0)
+    flat = rng.choice(DIMS[0] * DIMS[1], size=count, replace=False)
+    keys = np.stack(np.unravel_index(flat, DIMS), axis=1)
+    colors = rng.integers(0, 256, (count, 3))
+    capabilities = {'lighting_led_matrix': True, 'lighting_led_single': True}
+
+    proxy = MockProxy(latency)
+    fx = RazerAdvancedFX('MOCK0001', capabilities, daemon_dbus=proxy, matrix_dims=DIMS)
+    start = time.perf_counter()
+    for (row, col), rgb in zip(keys, colors):
+        fx.set_key(int(col), tuple(int(c) for c in rgb), int(row))
+    single = time.perf_counter() - start
+    print(f"set_key x{count}: {single * 1000:7.1f} ms, {proxy.calls} D-Bus calls")
+
+    proxy = MockProxy(latency)
+    fx = RazerAdvancedFX('MOCK0001', capabilities, daemon_dbus=proxy, matrix_dims=DIMS)
+    start = time.perf_counter()
+    fx.set_keys(keys, colors)
+    batch = time.perf_counter() - start
+    print(f"set_keys batch: {batch * 1000:7.1f} ms, {proxy.calls} D-Bus calls, {proxy.bytes} bytes")
+    print(f"speedup: {single / batch:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare sequential state reads with the pipelined RazerFX.fetch_state against a mock bus.
+
+Every mock D-Bus method call costs LATENCY seconds. Sequential reads pay that four
+times, the pipelined fetch roughly once.
+
+    python benchmarks/bench_state_fetch.py [latency_ms] [iterations]
+"""
+import sys
+import threading
+import time
+
+from razer_control.core.fx import RazerFX
+
+
+class MockProxy:
+    """Stands in for a dbus ProxyObject; every method sleeps for the configured latency."""
+
+    REPLIES = {
+        'getEffect': 'static',
+        'getEffectColors': [0, 255, 0, 0, 0, 0, 0, 0, 0],
+        'getBrightness': 75.0,
+        'getDeviceName': 'Mock Keyboard',
+    }
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        reply = self.REPLIES.get(member)
+
+        def _call(*args, reply_handler=None, error_handler=None):
+            if reply_handler is None:
+                time.sleep(self.latency)
+                return reply
+            timer = threading.Timer(self.latency, reply_handler, args=(reply,))
+            timer.start()
+        return _call
+
+
+def bench_sequential(fx, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fx.effect
+        fx.colors
+        fx._brightness_dbus.getBrightness()
+        fx._misc_dbus.getDeviceName()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_pipelined(fx, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        done = threading.Event()
+        fx.fetch_state(lambda result: done.set(), lambda exc: done.set())
+        done.wait()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.005
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    fx = RazerFX('MOCK0001', {'lighting_static': True}, daemon_dbus=MockProxy(latency))
+
+    sequential = bench_sequential(fx, iterations)
+    pipelined = bench_pipelined(fx, iterations)
+
+    print(f"latency per call: {latency * 1000:.1f} ms, iterations: {iterations}")
+    print(f"sequential: {sequential * 1000:.2f} ms/state")
+    print(f"pipelined:  {pipelined * 1000:.2f} ms/state")
+    print(f"speedup:    {sequential / pipelined:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Verify the headless CLI stays light: importing it and RazerManager must not pull in
+gi.repository.Gtk (or Adw) or the per-key matrix classes, and the import time must stay within
+IMPORT_BUDGET_MS. NumPy is not checked: openrazer.client imports it on every real install.
+
+Runs in a fresh interpreter so earlier imports cannot hide anything.
+
+    python benchmarks/check_cli_imports.py
+"""
+import json
+import subprocess
+import sys
+
+from razer_control.cli import IMPORT_BUDGET_MS
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import razer_control.cli
+from razer_control.core import razer_manager
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+FORBIDDEN = ('gi.repository.Gtk', 'gi.repository.Adw', 'razer_control.ui', 'razer_control.app', 'razer_control.core.matrix')
+
+
+def main():
+    out = subprocess.run([sys.executable, '-c', PROBE], capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+
+    leaked = [name for name in result['modules'] if name.startswith(FORBIDDEN)]
+    print(f"import time {result['ms']:.1f} ms (budget {IMPORT_BUDGET_MS} ms), {len(result['modules'])} modules")
+    if leaked:
+        print(f"FAIL: GUI or matrix modules imported: {', '.join(leaked)}")
+        return 1
+    if result['ms'] > IMPORT_BUDGET_MS:
+        print("FAIL: import budget exceeded")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
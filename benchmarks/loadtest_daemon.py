@@ -0,0 +1,80 @@
+"""
+Load-test a running control daemon (razer-control --daemon).
+
+Keeps up to WINDOW requests in flight on one connection and reports throughput
+and latency percentiles, matched by request id.
+
+    python benchmarks/loadtest_daemon.py [--socket PATH] [--requests N] [--window W] [--cmd ping|state|set-brightness]
+"""
+import argparse
+import json
+import socket
+import time
+
+from razer_control.daemon import default_socket_path
+
+
+def build_request(cmd, request_id, device):
+    request = {'id': request_id, 'cmd': cmd}
+    if device:
+        request['device'] = device
+    if cmd == 'set-brightness':
+        request['value'] = request_id % 101
+    elif cmd == 'set-effect':
+        request.update(effect='static', color=[request_id % 256, 0, 255 - request_id % 256])
+    return (json.dumps(request, separators=(',', ':')) + '\n').encode()
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--socket', default=default_socket_path())
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--window', type=int, default=32)
+    parser.add_argument('--cmd', default='ping')
+    parser.add_argument('--device')
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(args.socket)
+    reader = sock.makefile('rb')
+
+    sent_at = {}
+    latencies = []
+    errors = 0
+    next_id = 0
+
+    start = time.perf_counter()
+    while len(latencies) + errors < args.requests:
+        # Top up the pipeline, then read one response
+        burst = []
+        while next_id < args.requests and len(sent_at) < args.window:
+            burst.append(build_request(args.cmd, next_id, args.device))
+            sent_at[next_id] = time.perf_counter()
+            next_id += 1
+        if burst:
+            sock.sendall(b''.join(burst))
+
+        response = json.loads(reader.readline())
+        latency = time.perf_counter() - sent_at.pop(response['id'])
+        if response['ok']:
+            latencies.append(latency)
+        else:
+            errors += 1
+    elapsed = time.perf_counter() - start
+    sock.close()
+
+    latencies.sort()
+    print(f"{args.requests} x {args.cmd}, window {args.window}: {args.requests / elapsed:.0f} req/s, {errors} errors")
+    if latencies:
+        print("latency ms: " + ", ".join(
+            f"p{pct} {percentile(latencies, pct) * 1000:.3f}" for pct in (50, 90, 99)
+        ) + f", max {latencies[-1] * 1000:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""
+Benchmark suite for the core hot paths, run against the mock daemon with injected D-Bus latency.
+
+Every benchmark reports the median time per operation and, where D-Bus is involved,
+the number of mock D-Bus calls per operation. Results are compared against a JSON
+baseline; the run fails (exit 1) if a benchmark got slower than the baseline by more
+than the threshold, makes more D-Bus calls than it used to, or ran without a baseline entry.
+
+    python benchmarks/suite.py                      # compare against benchmarks/baseline.json
+    python benchmarks/suite.py --update-baseline    # record a new baseline on this machine
+    python benchmarks/suite.py --only frame --threshold 0.5 --output results.json
+
+Timings are machine dependent, so benchmarks/baseline.json is not checked in: the first
+run on a machine records it, later runs compare against it.
+DevicePage construction needs GTK 4 / libadwaita and a display, and is skipped otherwise;
+it runs with GLib dispatch and includes the initial state load that pages do asynchronously.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for razer_control and tests
+
+from tests.mock_daemon import MockDaemon, install_stand_ins
+
+install_stand_ins()  # before any core import, in case dbus/openrazer are missing
+
+import numpy as np
+
+from razer_control.core.matrix import Frame
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25  # allowed slowdown relative to the baseline
+LATENCY = 0.0005          # injected per-call D-Bus latency in seconds
+MATRIX = (6, 22)
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number=200, repeat=5):
+    """Register fn(context) -> (op, calls) where op() is timed and calls() returns the mock D-Bus call total."""
+    def _register(fn):
+        BENCHMARKS[name] = (fn, number, repeat)
+        return fn
+    return _register
+
+
+def measure(op, number, repeat, calls=None):
+    op()  # warm up caches and proxies
+    samples = []
+    before = calls() if calls else 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        samples.append((time.perf_counter() - start) / number)
+    result = {'median_us': round(statistics.median(samples) * 1e6, 3), 'min_us': round(min(samples) * 1e6, 3)}
+    if calls:
+        result['dbus_calls'] = round((calls() - before) / (number * repeat), 3)
+    return result
+
+
+def _mock_manager(devices, **kwargs):
+    daemon = MockDaemon(devices=devices, matrix_dims=MATRIX, latency=LATENCY)
+    return daemon, daemon.manager(watch_hotplug=False, **kwargs)
+
+
+# Frame
+
+def _random_frame(dims=MATRIX):
+    frame = Frame(dims)
+    frame._matrix[...] = np.random.default_rng(0).integers(0, 256, frame._matrix.shape, dtype=np.uint8)
+    return frame
+
+
+@benchmark('frame.bytes', number=2000)
+def _frame_bytes():
+    frame = _random_frame()
+    return (lambda: bytes(frame)), None
+
+
+@benchmark('frame.wire_buffer', number=5000)
+def _frame_wire_buffer():
+    return _random_frame().wire_buffer, None
+
+
+@benchmark('frame.delta_binary', number=2000)
+def _frame_delta():
+    frame = _random_frame()
+    rows, cols = MATRIX
+    step = [0]
+
+    def op():
+        step[0] += 1
+        frame[step[0] % rows, step[0] % cols] = (step[0] % 256, 0, 0)
+        frame.delta_binary()
+    return op, None
+
+
+@benchmark('frame.set_pixel', number=2000)
+def _frame_set_pixel():
+    frame = Frame(MATRIX)
+    rows, cols = MATRIX
+
+    def op():
+        for row in range(rows):
+            for col in range(cols):
+                frame[row, col] = (row, col, 255)
+    return op, None
+
+
+@benchmark('frame.get_pixel', number=2000)
+def _frame_get_pixel():
+    frame = _random_frame()
+    rows, cols = MATRIX
+
+    def op():
+        for row in range(rows):
+            for col in range(cols):
+                frame[row, col]
+    return op, None
+
+
+# RazerManager against the mock daemon
+
+def _re_scan(devices):
+    def setup():
+        daemon, manager = _mock_manager(devices)
+        return manager.re_scan, daemon.total_calls
+    return setup
+
+
+for _count in (1, 8, 32):
+    benchmark(f'manager.re_scan[{_count}]', number=20)(_re_scan(_count))
+
+
+@benchmark('manager.get_current_state', number=100)
+def _get_state():
+    daemon, manager = _mock_manager(1)
+    serial = manager.devices.serials()[0]
+    return (lambda: manager.get_current_state(serial, refresh=True)), daemon.total_calls
+
+
+@benchmark('manager.get_current_state.cached', number=5000)
+def _get_state_cached():
+    daemon, manager = _mock_manager(1)
+    serial = manager.devices.serials()[0]
+    return (lambda: manager.get_current_state(serial)), daemon.total_calls
+
+
+@benchmark('manager.set_effect', number=100)
+def _set_effect():
+    daemon, manager = _mock_manager(1)
+    serial = manager.devices.serials()[0]
+    step = [0]
+
+    def op():
+        step[0] += 1
+        manager.set_effect('static', step[0] % 256, 0, 0, device_serial=serial)
+    return op, daemon.total_calls
+
+
+@benchmark('manager.set_effect.redundant', number=2000)
+def _set_effect_redundant():
+    daemon, manager = _mock_manager(1)
+    serial = manager.devices.serials()[0]
+    return (lambda: manager.set_effect('static', 255, 0, 0, device_serial=serial)), daemon.total_calls
+
+
+@benchmark('manager.set_effect.broadcast[8]', number=50)
+def _set_effect_broadcast():
+    daemon, manager = _mock_manager(8)
+    step = [0]
+
+    def op():
+        step[0] += 1
+        manager.set_effect('static', step[0] % 256, 0, 0)
+    return op, daemon.total_calls
+
+
+# UI
+
+def _gtk_available():
+    try:
+        import gi
+        gi.require_version('Gtk', '4.0')
+        gi.require_version('Adw', '1')
+        from gi.repository import Gtk
+        return Gtk.init_check()
+    except (ImportError, ValueError):
+        return False
+
+
+def _ui_manager(devices):
+    """A manager that dispatches to the GTK main loop, like the app, plus settle() to wait for its callbacks.
+
+    settle() iterates the default main context until every call submitted to the executor
+    has finished and its callback has run on this thread.
+    """
+    from gi.repository import GLib
+    from razer_control.core.device_executor import glib_dispatch
+
+    daemon, manager = _mock_manager(devices, dispatch=glib_dispatch)
+    outstanding = [0]
+    submit = manager.executor.submit
+
+    def _settled(handler):
+        def _run(value):
+            outstanding[0] -= 1
+            if handler:
+                handler(value)
+        return _run
+
+    def _submit(serial, fn, *args, callback=None, error_callback=None, **kwargs):
+        outstanding[0] += 1
+        if error_callback is None:
+            error_callback = lambda e: logging.error(f"Device call {getattr(fn, '__name__', fn)} for {serial} failed: {e}")
+        return submit(serial, fn, *args, callback=_settled(callback), error_callback=_settled(error_callback), **kwargs)
+
+    def settle():
+        context = GLib.MainContext.default()
+        while outstanding[0]:
+            context.iteration(True)
+
+    manager.executor.submit = _submit
+    return daemon, manager, settle
+
+
+@benchmark('ui.device_page', number=10, repeat=3)
+def _device_page():
+    if not _gtk_available():
+        return None
+    from razer_control.ui.device_page import DevicePage
+
+    daemon, manager, settle = _ui_manager(1)
+    device = manager.devices.first()
+
+    def op():
+        DevicePage(device, manager)
+        settle()
+    return op, daemon.total_calls
+
+
+def _main_window(devices):
+    """Window construction up to the first selected page; pages of the other devices are built lazily."""
+    def setup():
+        if not _gtk_available():
+            return None
+        from razer_control.ui.window import MainWindow
+
+        daemon, manager, settle = _ui_manager(devices)
+
+        def op():
+            MainWindow(None, manager, prefetch_pages=False)
+            settle()
+        return op, daemon.total_calls
+    return setup
+
+
+for _count in (1, 12):
+    benchmark(f'ui.main_window[{_count}]', number=5, repeat=3)(_main_window(_count))
+
+
+def run(selected):
+    results = {}
+    for name, (setup, number, repeat) in BENCHMARKS.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        prepared = setup()
+        if prepared is None:
+            print(f"{name:<36} skipped")
+            continue
+        op, calls = prepared
+        results[name] = measure(op, number, repeat, calls)
+        extra = f"  {results[name]['dbus_calls']:6.2f} D-Bus calls" if calls else ""
+        print(f"{name:<36} {results[name]['median_us']:12.2f} us{extra}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            # Otherwise a benchmark nobody recorded (e.g. the GTK ones) could never regress
+            failures.append(f"{name}: no baseline, record one with --update-baseline on this machine")
+            continue
+        limit = base['median_us'] * (1 + threshold)
+        if result['median_us'] > limit:
+            failures.append(f"{name}: {result['median_us']:.2f} us > {limit:.2f} us "
+                            f"(baseline {base['median_us']:.2f} us + {threshold:.0%})")
+        if 'dbus_calls' in base and result.get('dbus_calls', 0) > base['dbus_calls']:
+            failures.append(f"{name}: {result['dbus_calls']} D-Bus calls per op, baseline {base['dbus_calls']}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the core hot paths against the mock daemon.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, default 0.25")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    parser.add_argument('--only', nargs='*', default=[], help="benchmark name prefixes to run")
+    args = parser.parse_args(argv)
+
+    results = run(args.only)
+    document = {'latency_ms': LATENCY * 1000, 'matrix': list(MATRIX), 'python': sys.version.split()[0], 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    except FileNotFoundError:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"No baseline at {args.baseline}, recorded this run as the baseline")
+        return 0
+
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
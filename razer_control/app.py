@@ -0,0 +1,78 @@
+import logging
+import gi
+
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+
+from gi.repository import Adw
+from dbus.mainloop.glib import DBusGMainLoop
+from .ui.window import MainWindow
+from .core.razer_manager import RazerManager
+from .core.profiles import LAST_PROFILE
+from .core.dbus_pool import dbus_pool
+
+class RazerControlApp(Adw.Application):
+    """Main Application class for Razer Control."""
+
+    SHUTDOWN_TIMEOUT = 2.0  # Sekunden, die auf ausstehende Schreibzugriffe gewartet wird
+    
+    def __init__(self, profiler=None):
+        super().__init__(application_id='de.dalu_wins.RazerControl')
+        self.razer_manager = None
+        self.window = None
+        self.profiler = profiler # StartupProfile bei --profile-startup
+        if profiler:
+            profiler.mark('imports')
+
+    def do_activate(self):
+        """Initializes manager and presents the main window."""
+        if not self.razer_manager:
+            # Asynchrone D-Bus Antworten laufen über die GLib Mainloop
+            DBusGMainLoop(set_as_default=True)
+            if self.profiler:
+                self._connect_bus()
+                self.profiler.mark('dbus connect')
+            self.razer_manager = RazerManager(pipelined_reads=True)
+            if self.profiler:
+                self.profiler.mark('device enumeration')
+        
+        # Ensure window is only created once
+        if not self.window:
+            self.window = MainWindow(self, self.razer_manager, prefetch_pages=not self.profiler)
+            if self.profiler:
+                self.profiler.mark('page construction')
+                self.window.add_tick_callback(self._on_first_frame)
+            
+        self.window.present()
+
+    @staticmethod
+    def _connect_bus():
+        try:
+            dbus_pool.bus
+        except Exception as e:
+            logging.error(f"Could not connect to the session bus: {e}")
+
+    def _on_first_frame(self, widget, frame_clock):
+        """--profile-startup: the window is on screen, print the phases and quit."""
+        self.profiler.mark('first present')
+        self.profiler.report()
+        self.quit()
+        return False
+
+    def do_shutdown(self):
+        """Remembers the current lighting, so `razer-control --apply-profile last` can restore it.
+
+        Not with --profile-startup: that run quits by itself and must not overwrite `last`.
+        """
+        if self.razer_manager:
+            # Pending slider values first, then wait until the workers have written them
+            self.razer_manager.write_scheduler.flush()
+            if not self.razer_manager.executor.drain(self.SHUTDOWN_TIMEOUT):
+                logging.warning("Device writes still pending at shutdown")
+            if len(self.razer_manager.devices) and not self.profiler:
+                try:
+                    self.razer_manager.save_profile(LAST_PROFILE)
+                except Exception as e:
+                    logging.error(f"Could not save profile: {e}")
+            self.razer_manager.executor.shutdown()
+        Adw.Application.do_shutdown(self)
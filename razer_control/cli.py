@@ -0,0 +1,132 @@
+"""Headless command line interface. Drives RazerManager directly and never imports GTK/Adw."""
+import argparse
+import json
+import sys
+import time
+
+_STARTED = time.perf_counter()
+
+IMPORT_BUDGET_MS = 250  # checked by benchmarks/check_cli_imports.py
+EFFECTS = ['static', 'breathSingle', 'breathRandom', 'spectrum', 'wave', 'reactive', 'none']
+
+
+def _parse_color(value):
+    value = value.lstrip('#')
+    if len(value) != 6:
+        raise argparse.ArgumentTypeError("color must be RRGGBB")
+    try:
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        raise argparse.ArgumentTypeError("color must be RRGGBB")
+
+
+def _parse_brightness(value):
+    try:
+        brightness = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("brightness must be a number")
+    if not 0 <= brightness <= 100:
+        raise argparse.ArgumentTypeError("brightness must be between 0 and 100")
+    return brightness
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog='razer-control-cli', description="Control Razer devices without the GUI.")
+    parser.add_argument('--timing', action='store_true', help="print import and startup time to stderr")
+    parser.add_argument('--stats-json', metavar='PATH', help="write per-device call latencies and errors to PATH")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help="list connected devices")
+
+    state = sub.add_parser('state', help="print device state as JSON")
+    state.add_argument('--device', help="serial, default: all devices")
+
+    effect = sub.add_parser('set-effect', help="apply a lighting effect")
+    effect.add_argument('effect', choices=EFFECTS)
+    effect.add_argument('--color', type=_parse_color, default=(0, 255, 0), help="RRGGBB, default 00FF00")
+    effect.add_argument('--device', help="serial, default: all devices")
+
+    brightness = sub.add_parser('set-brightness', help="set brightness 0-100")
+    brightness.add_argument('value', type=_parse_brightness)
+    brightness.add_argument('--device', help="serial, default: all devices")
+
+    for name in ('apply-profile', 'save-profile'):
+        profile = sub.add_parser(name, help=f"{name.split('-')[0]} a stored profile")
+        profile.add_argument('name')
+
+    return parser
+
+
+def _print_report(report, require_ok=False):
+    """Print a manager report; exit code 1 on errors, or with require_ok if no device applied the command."""
+    for serial, result in report.items():
+        print(f"{serial}: {result}")
+    if require_ok and 'ok' not in report.values():
+        return 1
+    return 0 if all(result in ('ok', 'unsupported') for result in report.values()) else 1
+
+
+def _run(args, manager):
+    if args.command == 'list':
+        for dev in manager.devices:
+            print(f"{dev.serial}\t{dev.name}\t{', '.join(manager.get_all_supported_effects(dev.serial))}")
+        return 0
+
+    if args.command == 'state':
+        if args.device and args.device not in manager.devices:
+            print(f"Unknown device: {args.device}", file=sys.stderr)
+            return 1
+        serials = [args.device] if args.device else manager.devices.serials()
+        states = {serial: manager.get_current_state(serial) for serial in serials}
+        print(json.dumps(states, indent=2, default=str))
+        return 0
+
+    if args.command in ('set-effect', 'set-brightness') and args.device and args.device not in manager.devices:
+        print(f"Unknown device: {args.device}", file=sys.stderr)
+        return 1
+
+    if args.command == 'set-effect':
+        r, g, b = args.color
+        report = manager.set_effect(args.effect, r, g, b, device_serial=args.device, force=True)
+        return _print_report(report, require_ok=True)
+
+    if args.command == 'set-brightness':
+        report = manager.set_brightness(args.value, device_serial=args.device, force=True)
+        return _print_report(report, require_ok=True)
+
+    if args.command == 'save-profile':
+        manager.save_profile(args.name)
+        print(f"Saved profile {args.name} for {len(manager.devices)} devices.")
+        return 0
+
+    report = manager.apply_profile(args.name)
+    if report is None:
+        print(f"Unknown profile: {args.name}", file=sys.stderr)
+        return 1
+    return _print_report(report)
+
+
+def main(argv=None):
+    """Entry point for razer-control-cli."""
+    args = _build_parser().parse_args(argv)
+
+    from razer_control.core.device_executor import direct_dispatch
+    from razer_control.core.razer_manager import RazerManager
+
+    imported = time.perf_counter()
+    manager = RazerManager(dispatch=direct_dispatch, watch_hotplug=False)
+    ready = time.perf_counter()
+    try:
+        return _run(args, manager)
+    finally:
+        manager.executor.shutdown(wait=False)
+        if args.stats_json:
+            from razer_control.core.instrumentation import instrumentation
+            instrumentation.dump(args.stats_json)
+        if args.timing:
+            print(f"imports {(imported - _STARTED) * 1000:.1f} ms, device scan {(ready - imported) * 1000:.1f} ms, "
+                  f"total {(time.perf_counter() - _STARTED) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+from collections import deque
+
+
+class AnimationEngine:
+    """Renders a per-key effect into a RazerAdvancedFX matrix at a fixed frame rate on a background thread.
+
+    render(frame, t) draws frame number t (seconds since start) into the given Frame.
+    When rendering plus the D-Bus upload take longer than one frame, the missed ticks
+    are dropped instead of being caught up, so a slow bus never builds a backlog.
+    """
+
+    def __init__(self, advanced_fx, render, fps=30.0, window=120):
+        self.advanced_fx = advanced_fx
+        self.render = render
+        self.fps = fps
+
+        self.frames = 0
+        self.dropped = 0
+        self._frame_times = deque(maxlen=window)  # seconds spent rendering + drawing
+        self._frame_stamps = deque(maxlen=window)  # monotonic time each frame was sent
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="razer-animation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Ask the render thread to stop and wait up to timeout. Returns False if it is still drawing."""
+        self._stop.set()
+        return self.join(timeout)
+
+    def join(self, timeout=None):
+        """Wait for the render thread to exit. Returns True once it has (or never ran)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def stats(self):
+        """Return target/achieved FPS, frame time (ms) and frame counters."""
+        stamps = list(self._frame_stamps)
+        times = list(self._frame_times)
+        achieved = (len(stamps) - 1) / (stamps[-1] - stamps[0]) if len(stamps) > 1 and stamps[-1] > stamps[0] else 0.0
+        return {
+            'target_fps': self.fps,
+            'fps': achieved,
+            'frame_time_avg_ms': sum(times) / len(times) * 1000 if times else 0.0,
+            'frame_time_max_ms': max(times) * 1000 if times else 0.0,
+            'frames': self.frames,
+            'dropped': self.dropped,
+        }
+
+    def _run(self):
+        interval = 1.0 / self.fps
+        start = time.monotonic()
+        deadline = start
+
+        while not self._stop.is_set():
+            began = time.monotonic()
+            try:
+                self.render(self.advanced_fx.matrix, began - start)
+                if self._stop.is_set():
+                    break  # stopped while rendering: do not draw over the restored effect
+                self.advanced_fx.draw()
+            except Exception as e:
+                logging.error(f"Animation stopped: {e}")
+                break
+            done = time.monotonic()
+
+            self.frames += 1
+            self._frame_times.append(done - began)
+            self._frame_stamps.append(done)
+
+            deadline += interval
+            if done > deadline:
+                # Too slow for this tick: skip to the next future tick instead of queueing frames
+                missed = int((done - deadline) / interval) + 1
+                self.dropped += missed
+                deadline += missed * interval
+            self._stop.wait(deadline - time.monotonic())
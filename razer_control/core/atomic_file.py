@@ -0,0 +1,22 @@
+import json
+import os
+import tempfile
+
+
+def write_json_atomic(path, data, prefix='.tmp-', **dump_kwargs):
+    """Write data as JSON to a temp file next to path, fsync it and rename it over path.
+
+    A crash leaves either the old or the new file, never half of one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
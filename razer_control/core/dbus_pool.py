@@ -0,0 +1,99 @@
+import threading
+
+import dbus as _dbus
+
+from razer_control.core.instrumentation import TimedInterface, instrumentation
+
+
+class DBusPool:
+    """Shares one bus connection, one proxy per object path and one interface per (path, interface)."""
+
+    def __init__(self, bus_factory=_dbus.SessionBus, recorder=instrumentation):
+        self._bus_factory = bus_factory
+        self._recorder = recorder  # None: hand out plain, untimed interfaces
+        self._bus = None
+        self._objects = {}     # (bus_name, object_path) -> ProxyObject
+        self._interfaces = {}  # (object_path, interface) -> Interface
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def bus(self):
+        """The shared bus connection, opened on first use."""
+        with self._lock:
+            if self._bus is None:
+                self._bus = self._bus_factory()
+            return self._bus
+
+    def get_object(self, bus_name, object_path):
+        """Return the shared proxy for an object path, creating it (and its introspection) only once."""
+        bus = self.bus
+        key = (bus_name, object_path)
+        with self._lock:
+            proxy = self._objects.get(key)
+            if proxy is not None:
+                self.hits += 1
+                return proxy
+            self.misses += 1
+            proxy = bus.get_object(bus_name, object_path)
+            self._objects[key] = proxy
+            return proxy
+
+    def get_interface(self, proxy, interface):
+        """Return the shared Interface wrapper of a proxy, timed per device and method by the recorder.
+
+        Keyed by object path, not proxy identity: a proxy passed in from outside the pool (e.g.
+        daemon_dbus) shares the wrapper of its path instead of being kept alive under its id(),
+        which may also be reused once it is garbage collected.
+        """
+        object_path = getattr(proxy, 'object_path', None)
+        if object_path is None:
+            return self._wrap(proxy, interface, '')  # no path to key on, not cached
+        key = (str(object_path), interface)
+        with self._lock:
+            iface = self._interfaces.get(key)
+            if iface is not None:
+                self.hits += 1
+                return iface
+            self.misses += 1
+            iface = self._wrap(proxy, interface, key[0])
+            self._interfaces[key] = iface
+            return iface
+
+    def _wrap(self, proxy, interface, object_path):
+        iface = _dbus.Interface(proxy, interface)
+        if self._recorder is not None:
+            iface = TimedInterface(iface, object_path.rsplit('/', 1)[-1] or object_path, self._recorder)
+        return iface
+
+    def reset(self, bus_factory=None):
+        """Drop the connection and every cached proxy, optionally switching to another bus (e.g. a mock)."""
+        with self._lock:
+            if bus_factory is not None:
+                self._bus_factory = bus_factory
+            self._bus = None
+            self._objects.clear()
+            self._interfaces.clear()
+
+    def release(self, object_path):
+        """Forget every proxy and interface of an object path, e.g. after a device was unplugged."""
+        with self._lock:
+            for key in [k for k in self._objects if k[1] == object_path]:
+                del self._objects[key]
+            for key in [k for k in self._interfaces if k[0] == object_path]:
+                del self._interfaces[key]
+
+    def stats(self):
+        """Return the number of live proxies/interfaces and how often they were reused."""
+        with self._lock:
+            return {
+                'objects': len(self._objects),
+                'interfaces': len(self._interfaces),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+dbus_pool = DBusPool()
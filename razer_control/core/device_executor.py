@@ -0,0 +1,141 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future, wait as wait_futures
+
+
+def glib_dispatch(fn, *args):
+    """Run fn(*args) on the GLib main loop (the GTK UI thread)."""
+    from gi.repository import GLib
+
+    def _run():
+        fn(*args)
+        return GLib.SOURCE_REMOVE
+
+    GLib.idle_add(_run)
+
+
+def direct_dispatch(fn, *args):
+    """Run fn(*args) right away on the calling (worker) thread. Used without a main loop."""
+    fn(*args)
+
+
+class _Worker:
+    """
+    One daemon thread running calls in submission order, like ThreadPoolExecutor(max_workers=1).
+
+    ThreadPoolExecutor threads are joined at interpreter exit, so a single hung D-Bus call
+    kept e.g. the CLI alive long after its report was printed. Daemon threads are not.
+    """
+
+    def __init__(self, name):
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new calls after shutdown")
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    item[0].cancel()
+            self._queue.put(None)
+        if wait and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while (item := self._queue.get()) is not None:
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+class DeviceExecutor:
+    """Runs blocking D-Bus calls on one worker thread per device and hands results back via a dispatcher."""
+
+    BROADCAST = '*'
+
+    def __init__(self, dispatch=glib_dispatch):
+        self._dispatch = dispatch
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def _worker(self, serial):
+        key = serial if serial is not None else self.BROADCAST
+        with self._lock:
+            worker = self._workers.get(key)
+            if worker is None:
+                worker = _Worker(f"razer-{key}")
+                self._workers[key] = worker
+            return worker
+
+    def submit(self, serial, fn, *args, callback=None, error_callback=None, **kwargs):
+        """
+        Queue fn(*args, **kwargs) on the worker of the given device.
+
+        Calls for the same device run in order. callback(result) or error_callback(exc)
+        are marshalled through the dispatcher. Returns a concurrent.futures.Future.
+        """
+        future = self._worker(serial).submit(fn, *args, **kwargs)
+
+        def _done(fut):
+            if fut.cancelled():  # e.g. by shutdown(); exception() would raise CancelledError
+                return
+            exc = fut.exception()
+            if exc is not None:
+                if error_callback:
+                    self._dispatch(error_callback, exc)
+                else:
+                    logging.error(f"Device call {getattr(fn, '__name__', fn)} for {serial} failed: {exc}")
+            elif callback:
+                self._dispatch(callback, fut.result())
+
+        future.add_done_callback(_done)
+        return future
+
+    def drain(self, timeout=None):
+        """
+        Wait until every call queued so far has run, at most timeout seconds.
+
+        Returns False if a worker is still busy, e.g. on a hung device.
+        """
+        with self._lock:
+            workers = list(self._workers.values())
+        barriers = [worker.submit(lambda: None) for worker in workers]
+        _, pending = wait_futures(barriers, timeout=timeout)
+        return not pending
+
+    def remove(self, serial):
+        """Stop the worker of an unplugged device; queued calls are cancelled. A later submit starts a new one."""
+        with self._lock:
+            worker = self._workers.pop(serial, None)
+        if worker is not None:
+            worker.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait=False):
+        """Stop all worker threads."""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,66 @@
+class DeviceRecord:
+    """One connected device: stable id, serial, display name, our RazerFX and the openrazer device."""
+
+    __slots__ = ('id', 'serial', 'name', 'fx', 'raw')
+
+    def __init__(self, device_id, serial, name, fx, raw):
+        self.id = device_id
+        self.serial = serial
+        self.name = name
+        self.fx = fx
+        self.raw = raw
+
+    def __repr__(self):
+        return f"DeviceRecord(id={self.id}, serial={self.serial!r}, name={self.name!r})"
+
+
+class DeviceRegistry:
+    """Insertion-ordered device records with O(1) lookup by serial.
+
+    Ids are handed out per serial once and survive rescans and replugging, so
+    a device keeps its id for the lifetime of the registry.
+    """
+
+    def __init__(self):
+        self._records = {}  # serial -> DeviceRecord
+        self._ids = {}      # serial -> id, never shrinks
+
+    def add(self, serial, name, fx, raw):
+        """Create (or replace) the record for a serial and return it."""
+        device_id = self._ids.setdefault(serial, len(self._ids))
+        record = DeviceRecord(device_id, serial, name, fx, raw)
+        self._records[serial] = record
+        return record
+
+    def remove(self, serial):
+        """Remove and return the record for a serial, or None if unknown."""
+        return self._records.pop(serial, None)
+
+    def get(self, serial):
+        return self._records.get(serial)
+
+    def first(self):
+        return next(iter(self._records.values()), None)
+
+    def select(self, serial=None):
+        """Records addressed by a command: the one matching serial, or all if serial is None."""
+        if serial is None:
+            return list(self._records.values())
+        record = self._records.get(serial)
+        return [record] if record else []
+
+    def serials(self):
+        return list(self._records)
+
+    def clear(self):
+        self._records.clear()
+
+    def __contains__(self, serial):
+        return serial in self._records
+
+    def __iter__(self):
+        # Snapshot, so worker threads can iterate while the UI thread applies hotplug diffs
+        return iter(list(self._records.values()))
+
+    def __len__(self):
+        return len(self._records)
@@ -1,12 +1,14 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-import numpy as _np
-import numpy.typing as _npt
+import threading as _threading
+
 import dbus as _dbus
 # from openrazer.client.constants import WAVE_LEFT, WAVE_RIGHT, REACTIVE_500MS, REACTIVE_1000MS, REACTIVE_1500MS, REACTIVE_2000MS
 from openrazer.client import constants as c
 from types import FunctionType
 
+from razer_control.core.dbus_pool import dbus_pool as _pool
+
 # TODO logging.debug if value out of range v1.1
 
 
@@ -35,8 +37,7 @@ class BaseRazerFX(object):
         self._capabilities = capabilities
 
         if daemon_dbus is None:
-            session_bus = _dbus.SessionBus()
-            daemon_dbus = session_bus.get_object("org.razer", "/org/razer/device/{0}".format(serial))
+            daemon_dbus = _pool.get_object("org.razer", "/org/razer/device/{0}".format(serial))
         self._dbus = daemon_dbus
 
     def has(self, capability: str) -> bool:
@@ -53,97 +54,65 @@ class BaseRazerFX(object):
         return self._capabilities.get('lighting_' + capability, False)
 
 
-class RazerAdvancedFX(BaseRazerFX):
+class RazerFX(BaseRazerFX):
+    advanced: 'RazerAdvancedFX | None'
+
     def __init__(self, serial: str, capabilities: dict[str, bool], daemon_dbus: _dbus.proxies.ProxyObject = None, matrix_dims: tuple[int, int] = (-1, -1)):
         super().__init__(serial, capabilities, daemon_dbus)
 
-        # Only init'd when there's a matrix
-        self._capabilities = capabilities
-
-        if not all([dim >= 1 for dim in matrix_dims]):
-            raise ValueError("Matrix dimensions cannot contain -1")
-
-        if daemon_dbus is None:
-            session_bus = _dbus.SessionBus()
-            daemon_dbus = session_bus.get_object("org.razer", "/org/razer/device/{0}".format(serial))
+        self._lighting_dbus = _pool.get_interface(self._dbus, "razer.device.lighting.chroma")
 
-        self._matrix_dims = matrix_dims
-        self._lighting_dbus = _dbus.Interface(daemon_dbus, "razer.device.lighting.chroma")
+        # all() part basically checks that all dimensions are present (-1 is bad)
+        if self.has('led_matrix') and all([dim >= 1 for dim in matrix_dims]):
+            # The matrix classes are only loaded for devices with a key matrix
+            from razer_control.core.matrix import RazerAdvancedFX
+            self.advanced = RazerAdvancedFX(serial, capabilities, daemon_dbus=self._dbus, matrix_dims=matrix_dims)
+        else:
+            self.advanced = None
 
-        self.matrix = Frame(matrix_dims)
+        # Only keyboards will have ripple set
+        if self.has('led_matrix') and self.has('ripple'):
+            self._custom_lighting_dbus = _pool.get_interface(self._dbus, "razer.device.lighting.custom")
+        else:
+            self._custom_lighting_dbus = None
 
-    @property
-    def cols(self) -> int:
-        """
-        Number of columns in matrix
+        self._misc = None
 
-        :return: Columns
-        :rtype: int
-        """
-        return self._matrix_dims[1]
+        self._brightness_dbus = _pool.get_interface(self._dbus, "razer.device.lighting.brightness")
+        self._misc_dbus = _pool.get_interface(self._dbus, "razer.device.misc")
 
     @property
-    def rows(self) -> int:
+    def misc(self) -> 'MiscLighting':
         """
-        Number of rows in matrix
+        Misc lighting zones (logo, scroll wheel, ...), created on first access
 
-        :return: Rows
-        :rtype: int
+        :return: MiscLighting
+        :rtype: MiscLighting
         """
-        return self._matrix_dims[0]
-
-    def _draw(self, ba: bytes) -> None:
-        self._lighting_dbus.setKeyRow(ba)
-
-        self._lighting_dbus.setCustom()
+        if self._misc is None:
+            self._misc = MiscLighting(self._serial, self._capabilities, self._dbus)
+        return self._misc
 
-    def draw(self) -> None:
+    def fetch_state(self, reply_handler: FunctionType, error_handler: FunctionType) -> None:
         """
-        Draw what's in the current frame buffer
-        """
-        self._draw(bytes(self.matrix))
+        Fetch effect, colors, brightness and device name in one pipelined round trip
 
-    def draw_fb_or(self) -> None:
-        self._draw(bytes(self.matrix.draw_with_fb_or()))
+        All four method calls are sent without waiting for each other; the replies are
+        gathered and handed to reply_handler once the last one arrived. Needs a D-Bus
+        main loop (DBusGMainLoop) to deliver the replies.
 
-    def set_key(self, column_id: int, rgb: bytes, row_id: int = 0) -> None:  # Not needed on mice
-        if self.has('led_single'):
-            if isinstance(rgb, (tuple, list)) and len(rgb) == 3 and all([isinstance(component, int) for component in rgb]):
-                if row_id < self._matrix_dims[0] and column_id < self._matrix_dims[1]:
-                    self._lighting_dbus.setKey(row_id, column_id, [clamp_ubyte(component) for component in rgb])
-                else:
-                    raise ValueError("Row or column out of bounds. Max dimensions are: {0},{1}".format(*self._matrix_dims))
-            else:
-                raise ValueError("RGB must be an RGB tuple")
+        :param reply_handler: Called with a dict with the keys effect, colors, brightness and name
+        :type reply_handler: callable
 
-    def restore(self) -> None:
+        :param error_handler: Called with the first D-Bus exception, instead of reply_handler
+        :type error_handler: callable
         """
-        Restore the device to the last effect
-        """
-        self._lighting_dbus.restoreLastEffect()
+        request = _StateRequest(('effect', 'colors', 'brightness', 'name'), reply_handler, error_handler)
 
-
-class RazerFX(BaseRazerFX):
-    advanced: RazerAdvancedFX | None
-
-    def __init__(self, serial: str, capabilities: dict[str, bool], daemon_dbus: _dbus.proxies.ProxyObject = None, matrix_dims: tuple[int, int] = (-1, -1)):
-        super().__init__(serial, capabilities, daemon_dbus)
-
-        self._lighting_dbus = _dbus.Interface(self._dbus, "razer.device.lighting.chroma")
-
-        # all() part basically checks that all dimensions are present (-1 is bad)
-        if self.has('led_matrix') and all([dim >= 1 for dim in matrix_dims]):
-            self.advanced = RazerAdvancedFX(serial, capabilities, daemon_dbus=self._dbus, matrix_dims=matrix_dims)
-        else:
-            self.advanced = None
-
-        # Only keyboards will have ripple set
-        if self.has('led_matrix') and self.has('ripple'):
-            self._custom_lighting_dbus = _dbus.Interface(self._dbus, "razer.device.lighting.custom")
-        else:
-            self._custom_lighting_dbus = None
-
-        self.misc = MiscLighting(serial, capabilities, self._dbus)
+        self._lighting_dbus.getEffect(reply_handler=request.handler('effect', str), error_handler=request.error)
+        self._lighting_dbus.getEffectColors(reply_handler=request.handler('colors', bytes), error_handler=request.error)
+        self._brightness_dbus.getBrightness(reply_handler=request.handler('brightness', float), error_handler=request.error)
+        self._misc_dbus.getDeviceName(reply_handler=request.handler('name', str), error_handler=request.error)
 
     @property
     def effect(self) -> str:
@@ -687,12 +656,45 @@ class RazerFX(BaseRazerFX):
         return False
 
 
+class _StateRequest(object):
+    """
+    Gathers the replies of several asynchronous D-Bus calls into one dict
+    """
+    def __init__(self, keys: tuple[str, ...], reply_handler: FunctionType, error_handler: FunctionType):
+        self._missing = set(keys)
+        self._result = {}
+        self._reply_handler = reply_handler
+        self._error_handler = error_handler
+        self._done = False
+        self._lock = _threading.Lock()
+
+    def handler(self, key: str, convert: type) -> FunctionType:
+        def _reply(value):
+            with self._lock:
+                if self._done:
+                    return
+                self._result[key] = convert(value)
+                self._missing.discard(key)
+                if self._missing:
+                    return
+                self._done = True
+            self._reply_handler(self._result)
+        return _reply
+
+    def error(self, exc: Exception) -> None:
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        self._error_handler(exc)
+
+
 class SingleLed(BaseRazerFX):
     def __init__(self, serial: str, capabilities: dict[str, bool], daemon_dbus: _dbus.proxies.ProxyObject = None, led_name: str = 'logo'):
         super().__init__(serial, capabilities, daemon_dbus)
 
         self._led_name = led_name
-        self._lighting_dbus = _dbus.Interface(self._dbus, "razer.device.lighting.{0}".format(led_name))
+        self._lighting_dbus = _pool.get_interface(self._dbus, "razer.device.lighting.{0}".format(led_name))
 
     def _shas(self, item: str) -> bool:
         return self.has('{0}_{1}'.format(self._led_name, item))
@@ -1025,234 +1027,73 @@ class SingleLed(BaseRazerFX):
 
 
 class MiscLighting(BaseRazerFX):
-    _logo: SingleLed | None
-    _scroll: SingleLed | None
-    _left: SingleLed | None
-    _right: SingleLed | None
-    _charging: SingleLed | None
-    _fast_charging: SingleLed | None
-    _fully_charged: SingleLed | None
-    _backlight: SingleLed | None
+    _zones: dict[str, SingleLed | None]
 
     def __init__(self, serial: str, capabilities: dict[str, bool], daemon_dbus: _dbus.proxies.ProxyObject = None):
         super().__init__(serial, capabilities, daemon_dbus)
 
-        self._lighting_dbus = _dbus.Interface(self._dbus, "razer.device.lighting.logo")
-
-        if self.has('logo'):
-            self._logo = SingleLed(serial, capabilities, daemon_dbus, 'logo')
-        else:
-            self._logo = None
-
-        if self.has('scroll'):
-            self._scroll = SingleLed(serial, capabilities, daemon_dbus, 'scroll')
-        else:
-            self._scroll = None
+        # Zones are only built (and their D-Bus interfaces looked up) on first access
+        self._zones = {}
 
-        if self.has('left'):
-            self._left = SingleLed(serial, capabilities, daemon_dbus, 'left')
-        else:
-            self._left = None
-
-        if self.has('right'):
-            self._right = SingleLed(serial, capabilities, daemon_dbus, 'right')
-        else:
-            self._right = None
+    @property
+    def _lighting_dbus(self) -> _dbus.Interface:
+        return _pool.get_interface(self._dbus, "razer.device.lighting.logo")
 
-        if self.has('charging'):
-            self._charging = SingleLed(serial, capabilities, daemon_dbus, 'charging')
-        else:
-            self._charging = None
+    def _zone(self, led_name: str) -> SingleLed | None:
+        """
+        Get the SingleLed of a zone, creating it on first access
 
-        if self.has('fast_charging'):
-            self._fast_charging = SingleLed(serial, capabilities, daemon_dbus, 'fast_charging')
-        else:
-            self._fast_charging = None
+        :param led_name: Zone name, e.g. 'logo' or 'scroll'
+        :type led_name: str
 
-        if self.has('fully_charged'):
-            self._fully_charged = SingleLed(serial, capabilities, daemon_dbus, 'fully_charged')
-        else:
-            self._fully_charged = None
-
-        if self.has('backlight'):
-            self._backlight = SingleLed(serial, capabilities, daemon_dbus, 'backlight')
-        else:
-            self._backlight = None
+        :return: SingleLed or None if the device has no such zone
+        :rtype: SingleLed or None
+        """
+        if led_name not in self._zones:
+            if self.has(led_name):
+                self._zones[led_name] = SingleLed(self._serial, self._capabilities, self._dbus, led_name)
+            else:
+                self._zones[led_name] = None
+        return self._zones[led_name]
 
     @property
     def logo(self) -> SingleLed | None:
-        return self._logo
+        return self._zone('logo')
 
     @property
     def scroll_wheel(self) -> SingleLed | None:
-        return self._scroll
+        return self._zone('scroll')
 
     @property
     def left(self) -> SingleLed | None:
-        return self._left
+        return self._zone('left')
 
     @property
     def right(self) -> SingleLed | None:
-        return self._right
+        return self._zone('right')
 
     @property
     def charging(self) -> SingleLed | None:
-        return self._charging
+        return self._zone('charging')
 
     @property
     def fast_charging(self) -> SingleLed | None:
-        return self._fast_charging
+        return self._zone('fast_charging')
 
     @property
     def fully_charged(self) -> SingleLed | None:
-        return self._fully_charged
+        return self._zone('fully_charged')
 
     @property
     def backlight(self) -> SingleLed | None:
-        return self._backlight
+        return self._zone('backlight')
 
 
-class Frame(object):
+def __getattr__(name: str):
     """
-    Class to represent the RGB matrix of the keyboard. So to animate you'd use multiple frames
+    RazerAdvancedFX and Frame moved to razer_control.core.matrix, keep the old import path working
     """
-    _matrix: _npt.NDArray[_np.uint8]
-    _fb1: _npt.NDArray[_np.uint8]
-
-    def __init__(self, dimensions: tuple[int, int]):
-        self._rows, self._cols = dimensions
-        self._components = 3
-
-        self._init()
-
-    # Index with row, col OR y, x
-    def __getitem__(self, key: tuple[int, int]) -> tuple[int, int, int]:
-        """
-        Method to allow a slice to get an RGB tuple
-
-        :param key: Key, must be y,x tuple
-        :type key: tuple
-
-        :return: RGB tuple
-        :rtype: tuple
-
-        :raises AssertionError: If key is invalid
-        """
-        assert isinstance(key, tuple), "Key is not a tuple"
-        assert 0 <= key[0] < self._rows, "Row out of bounds"
-        assert 0 <= key[1] < self._cols, "Column out of bounds"
-
-        return tuple(self._matrix[:, key[0], key[1]])
-
-    # Index with row, col OR y, x
-    def __setitem__(self, key: tuple[int, int], rgb: tuple[int, int, int]) -> None:
-        """
-        Method to allow a slice to set an RGB tuple
-
-        :param key: Key, must be y,x tuple
-        :type key: tuple
-
-        :param rgb: RGB tuple
-        :type rgb: tuple
-
-        :raises AssertionError: If key is invalid
-        """
-        assert isinstance(key, tuple), "Key is not a tuple"
-        assert 0 <= key[0] < self._rows, "Row out of bounds"
-        assert 0 <= key[1] < self._cols, "Column out of bounds"
-        assert isinstance(rgb, (list, tuple)) and len(rgb) == 3, "Value must be a tuple,list of 3 RGB components"
-
-        self._matrix[:, key[0], key[1]] = rgb
-
-    def __bytes__(self) -> bytes:
-        """
-        When bytes() is ran on the class will return a binary capable of being sent to the driver
-
-        :return: Driver binary payload
-        :rtype: bytes
-        """
-        return b''.join([self.row_binary(row_id) for row_id in range(0, self._rows)])
-
-    def _init(self) -> None:
-        self._matrix = _np.zeros((self._components, self._rows, self._cols), 'uint8')
-        self._fb1 = _np.copy(self._matrix)
-
-    def reset(self) -> None:
-        """
-        Init/Clear the matrix
-        """
-        if self._matrix is None:
-            self._init()
-        else:
-            self._matrix.fill(0)
-
-    def set(self, y: int, x: int, rgb: tuple[int, int, int]) -> None:
-        """
-        Method to allow a slice to set an RGB tuple
-
-        :param y: Row
-        :type y: int
-
-        :param x: Column
-        :type x: int
-
-        :param rgb: RGB tuple
-        :type rgb: tuple
-
-        :raises AssertionError: If key is invalid
-        """
-        self.__setitem__((y, x), rgb)
-
-    def get(self, y: int, x: int) -> tuple[int, int, int]:
-        """
-        Method to allow a slice to get an RGB tuple
-
-        :param y: Row
-        :type y: int
-
-        :param x: Column
-        :type x: int
-
-        :return rgb: RGB tuple
-        :return rgb: tuple
-
-        :raises AssertionError: If key is invalid
-        """
-        return self.__getitem__((y, x))
-
-    def row_binary(self, row_id: int) -> bytes:
-        """
-        Get binary payload for 1 row which is compatible with the driver
-
-        :param row_id: Row ID
-        :type row_id: int
-
-        :return: Binary payload
-        :rtype: bytes
-        """
-        assert 0 <= row_id < self._rows, "Row out of bounds"
-
-        start = 0
-        end = self._cols - 1
-
-        return row_id.to_bytes(1, byteorder='big') + start.to_bytes(1, byteorder='big') + end.to_bytes(1, byteorder='big') + self._matrix[:, row_id].tobytes(order='F')
-
-    def to_binary(self) -> bytes:
-        """
-        Get the whole binary for the keyboard to be sent to the driver.
-
-        :return: Driver binary payload
-        :rtype: bytes
-        """
-        return bytes(self)
-
-    # Simple FB
-    def to_framebuffer(self) -> None:
-        self._fb1 = _np.copy(self._matrix)
-
-    def to_framebuffer_or(self) -> None:
-        self._fb1 = _np.bitwise_or(self._fb1, self._matrix)  # pylint: disable=no-member
-
-    def draw_with_fb_or(self) -> bytes:
-        self._matrix = _np.bitwise_or(self._fb1, self._matrix)  # pylint: disable=no-member
-        return bytes(self)
\ No newline at end of file
+    if name in ('RazerAdvancedFX', 'Frame'):
+        from razer_control.core import matrix
+        return getattr(matrix, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from razer_control.core.atomic_file import write_json_atomic
+
+# Upper bucket bounds in milliseconds; slower calls land in the overflow bucket
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+ALL_DEVICES = '*'  # key for calls that are not about one device (rescan, broadcast)
+
+
+class MethodStats:
+    """Call count, error count and a latency histogram for one (device, method)."""
+
+    __slots__ = ('calls', 'errors', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def record(self, seconds, error=False):
+        ms = seconds * 1000
+        self.calls += 1
+        self.errors += bool(error)
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        for index, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (max for the overflow bucket)."""
+        if not self.calls:
+            return 0.0
+        rank = pct / 100 * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return round(min(BUCKETS_MS[index], self.max) if index < len(BUCKETS_MS) else self.max, 3)
+        return round(self.max, 3)
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'avg_ms': round(self.total / self.calls, 3) if self.calls else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'max_ms': round(self.max, 3),
+            'histogram_ms': {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class Instrumentation:
+    """Per-device latency histograms and call/error counters for D-Bus, manager and UI calls.
+
+    Methods are named by layer: 'dbus.setStatic', 'manager.set_effect', 'ui.effect_changed'.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._methods = {}   # (device, method) -> MethodStats
+        self._counters = {}  # (device, name) -> int
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, device, method, seconds, error=False):
+        if not self.enabled:
+            return
+        key = (device or ALL_DEVICES, method)
+        with self._lock:
+            stats = self._methods.get(key)
+            if stats is None:
+                stats = self._methods[key] = MethodStats()
+            stats.record(seconds, error)
+
+    def count(self, device, name, n=1):
+        """Bump a plain counter, e.g. writes that were dropped as redundant."""
+        if not self.enabled:
+            return
+        key = (device or ALL_DEVICES, name)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    @contextmanager
+    def timed(self, device, method):
+        """Time the block; an exception counts as an error and is re-raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(device, method, time.perf_counter() - start, error=True)
+            raise
+        self.record(device, method, time.perf_counter() - start)
+
+    def wrap(self, device, method, fn):
+        """Return fn timed under (device, method)."""
+        def _timed(*args, **kwargs):
+            with self.timed(device, method):
+                return fn(*args, **kwargs)
+        return _timed
+
+    def snapshot(self):
+        """{'devices': {device: {'methods': {method: stats}, 'counters': {name: n}}}} as plain data."""
+        with self._lock:
+            methods = [(key, stats.to_dict()) for key, stats in self._methods.items()]
+            counters = list(self._counters.items())
+
+        devices = {}
+        for (device, method), stats in sorted(methods):
+            devices.setdefault(device, {'methods': {}, 'counters': {}})['methods'][method] = stats
+        for (device, name), value in sorted(counters):
+            devices.setdefault(device, {'methods': {}, 'counters': {}})['counters'][name] = value
+        return {'since': self.started, 'uptime_s': round(time.time() - self.started, 1), 'devices': devices}
+
+    def slowest(self, limit=10, key='p95_ms'):
+        """The (device, method, stats) entries with the highest latency, slowest first."""
+        rows = [
+            (device, method, stats)
+            for device, entry in self.snapshot()['devices'].items()
+            for method, stats in entry['methods'].items()
+        ]
+        return sorted(rows, key=lambda row: row[2][key], reverse=True)[:limit]
+
+    def dump(self, path):
+        """Write the snapshot as JSON (atomically, like the profile store). Returns the path."""
+        write_json_atomic(path, self.snapshot(), prefix='.stats-', indent=2)
+        logging.info(f"Instrumentation written to {path}")
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._counters.clear()
+        self.started = time.time()
+
+
+class TimedInterface:
+    """Wraps a dbus.Interface so every method call is recorded as 'dbus.<member>' for its device.
+
+    Async calls (reply_handler/error_handler) are timed until the reply arrives.
+    """
+
+    def __init__(self, iface, device, recorder):
+        self._iface = iface
+        self._device = device
+        self._recorder = recorder
+        self._methods = {}
+
+    def __getattr__(self, member):
+        method = self._methods.get(member)
+        if method is None:
+            method = self._methods[member] = self._timed_method(member, getattr(self._iface, member))
+        return method
+
+    def _timed_method(self, member, fn):
+        name = f"dbus.{member}"
+        device = self._device
+        recorder = self._recorder
+
+        def _call(*args, **kwargs):
+            start = time.perf_counter()
+            reply_handler = kwargs.get('reply_handler')
+            if reply_handler is not None:
+                error_handler = kwargs.get('error_handler')
+
+                def _reply(*result):
+                    recorder.record(device, name, time.perf_counter() - start)
+                    return reply_handler(*result)
+
+                def _error(e):
+                    recorder.record(device, name, time.perf_counter() - start, error=True)
+                    if error_handler:
+                        error_handler(e)
+
+                kwargs['reply_handler'] = _reply
+                kwargs['error_handler'] = _error
+                return fn(*args, **kwargs)
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                recorder.record(device, name, time.perf_counter() - start, error=True)
+                raise
+            recorder.record(device, name, time.perf_counter() - start)
+            return result
+        return _call
+
+
+def default_dump_path():
+    """$XDG_STATE_HOME/razer-control/instrumentation.json (~/.local/state if unset)."""
+    state_home = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(state_home, 'razer-control', 'instrumentation.json')
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,163 @@
+"""
+Whole-matrix effect kernels for Frame
+
+Every kernel writes straight into Frame._matrix (shape 3 x rows x cols) with NumPy
+array operations, so the cost per frame does not depend on a Python loop over keys.
+Kernels can be used directly as (or inside) AnimationEngine render callbacks.
+"""
+from functools import lru_cache
+
+import numpy as _np
+
+from razer_control.core.matrix import Frame
+
+
+@lru_cache(maxsize=16)
+def _grid(rows: int, cols: int) -> tuple[_np.ndarray, _np.ndarray]:
+    """
+    Row and column coordinates of every key, cached per matrix size (read only)
+    """
+    y, x = _np.mgrid[0:rows, 0:cols].astype(_np.float32)
+    y.flags.writeable = False
+    x.flags.writeable = False
+    return y, x
+
+
+def _rgb(rgb: tuple[int, int, int]) -> _np.ndarray:
+    return _np.asarray(rgb, dtype=_np.float32).reshape(3, 1, 1)
+
+
+def _write(frame: Frame, values: _np.ndarray) -> None:
+    _np.clip(values, 0, 255, out=values)
+    frame._matrix[...] = values
+
+
+def fill(frame: Frame, rgb: tuple[int, int, int]) -> None:
+    """
+    Fill the whole matrix with one color
+
+    :param rgb: RGB tuple
+    :type rgb: tuple
+    """
+    frame._matrix[...] = _np.asarray(rgb, dtype=_np.uint8).reshape(3, 1, 1)
+
+
+def gradient(frame: Frame, start: tuple[int, int, int], end: tuple[int, int, int], horizontal: bool = True) -> None:
+    """
+    Linear gradient from start to end
+
+    :param start: RGB at the left (or top) edge
+    :type start: tuple
+
+    :param end: RGB at the right (or bottom) edge
+    :type end: tuple
+
+    :param horizontal: Gradient along columns if True, along rows otherwise
+    :type horizontal: bool
+    """
+    y, x = _grid(frame._rows, frame._cols)
+    pos, length = (x, frame._cols) if horizontal else (y, frame._rows)
+    weight = pos / max(length - 1, 1)
+    _write(frame, _rgb(start) + (_rgb(end) - _rgb(start)) * weight)
+
+
+def wave(frame: Frame, t: float, rgb: tuple[int, int, int], wavelength: float = 8.0, speed: float = 1.0) -> None:
+    """
+    Sine brightness wave travelling along the columns
+
+    :param t: Time in seconds
+    :type t: float
+
+    :param rgb: Wave color at full intensity
+    :type rgb: tuple
+
+    :param wavelength: Wave length in keys
+    :type wavelength: float
+
+    :param speed: Waves per second
+    :type speed: float
+    """
+    _, x = _grid(frame._rows, frame._cols)
+    intensity = 0.5 + 0.5 * _np.sin(2 * _np.pi * (x / wavelength - speed * t))
+    _write(frame, _rgb(rgb) * intensity)
+
+
+def ripple(frame: Frame, t: float, center: tuple[int, int], rgb: tuple[int, int, int], speed: float = 10.0, width: float = 1.5) -> None:
+    """
+    Ring expanding from a key, e.g. the last pressed one
+
+    :param t: Seconds since the ripple started
+    :type t: float
+
+    :param center: (row, col) of the origin
+    :type center: tuple
+
+    :param rgb: Ring color
+    :type rgb: tuple
+
+    :param speed: Keys per second
+    :type speed: float
+
+    :param width: Ring width in keys
+    :type width: float
+    """
+    y, x = _grid(frame._rows, frame._cols)
+    distance = _np.hypot(y - center[0], x - center[1])
+    intensity = _np.clip(1.0 - _np.abs(distance - speed * t) / width, 0.0, 1.0)
+    _write(frame, _rgb(rgb) * intensity)
+
+
+def starlight(frame: Frame, rgb: tuple[int, int, int], density: float = 0.05, decay: float = 0.85, rng: _np.random.Generator | None = None) -> None:
+    """
+    Fade the current frame and light up random keys
+
+    :param rgb: Star color
+    :type rgb: tuple
+
+    :param density: Probability per key and frame to light up
+    :type density: float
+
+    :param decay: Brightness kept from the previous frame (0->1)
+    :type decay: float
+
+    :param rng: Random generator, for reproducible output
+    :type rng: numpy.random.Generator
+    """
+    rng = rng if rng is not None else _np.random.default_rng()
+    fade(frame, decay)
+    stars = rng.random((frame._rows, frame._cols)) < density
+    frame._matrix[:, stars] = _np.asarray(rgb, dtype=_np.uint8).reshape(3, 1)
+
+
+def fade(frame: Frame, factor: float) -> None:
+    """
+    Scale every key's brightness in place
+
+    :param factor: Multiplier, 0->1 darkens
+    :type factor: float
+    """
+    _write(frame, frame._matrix * _np.float32(factor))
+
+
+def hue_rotate(frame: Frame, degrees: float) -> None:
+    """
+    Rotate the hue of every key in HSV space, keeping saturation and value
+
+    :param degrees: Rotation angle
+    :type degrees: float
+    """
+    rgb = frame._matrix.astype(_np.float32) / 255.0
+    r, g, b = rgb
+    v = rgb.max(axis=0)
+    c = v - rgb.min(axis=0)
+
+    # RGB -> hue (0->6)
+    safe_c = _np.where(c == 0, 1.0, c)
+    h = _np.where(v == r, ((g - b) / safe_c) % 6.0,
+                  _np.where(v == g, (b - r) / safe_c + 2.0, (r - g) / safe_c + 4.0))
+    h = (h + degrees / 60.0) % 6.0
+
+    # hue -> RGB with the original chroma and value
+    k = (_np.array([5.0, 3.0, 1.0], dtype=_np.float32).reshape(3, 1, 1) + h) % 6.0
+    out = v - c * _np.clip(_np.minimum(k, 4.0 - k), 0.0, 1.0)
+    _write(frame, out * 255.0 + 0.5)
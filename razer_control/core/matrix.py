@@ -0,0 +1,370 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+"""
+Per-key (matrix) lighting: RazerAdvancedFX and Frame.
+
+Kept apart from fx.py so these classes are only imported for devices that have a key matrix.
+NumPy itself is loaded anyway: openrazer.client, which fx.py and RazerManager import, depends on it.
+"""
+
+import numpy as _np
+import numpy.typing as _npt
+import dbus as _dbus
+
+from razer_control.core.dbus_pool import dbus_pool as _pool
+from razer_control.core.fx import BaseRazerFX, clamp_ubyte
+
+class RazerAdvancedFX(BaseRazerFX):
+    def __init__(self, serial: str, capabilities: dict[str, bool], daemon_dbus: _dbus.proxies.ProxyObject = None, matrix_dims: tuple[int, int] = (-1, -1)):
+        super().__init__(serial, capabilities, daemon_dbus)
+
+        # Only init'd when there's a matrix
+        self._capabilities = capabilities
+
+        if not all([dim >= 1 for dim in matrix_dims]):
+            raise ValueError("Matrix dimensions cannot contain -1")
+
+        self._matrix_dims = matrix_dims
+        self._lighting_dbus = _pool.get_interface(self._dbus, "razer.device.lighting.chroma")
+
+        self.matrix = Frame(matrix_dims)
+
+        # Upload counters, see upload_stats()
+        self.uploads = 0
+        self.skipped_uploads = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+    @property
+    def cols(self) -> int:
+        """
+        Number of columns in matrix
+
+        :return: Columns
+        :rtype: int
+        """
+        return self._matrix_dims[1]
+
+    @property
+    def rows(self) -> int:
+        """
+        Number of rows in matrix
+
+        :return: Rows
+        :rtype: int
+        """
+        return self._matrix_dims[0]
+
+    def _draw(self, ba: bytes) -> None:
+        self._lighting_dbus.setKeyRow(ba)
+
+        self._lighting_dbus.setCustom()
+
+    def draw(self) -> None:
+        """
+        Draw what's in the current frame buffer
+
+        Only rows that changed since the last upload are sent. If nothing changed, no
+        D-Bus call is made at all.
+        """
+        payload = self.matrix.delta_binary()
+        self.bytes_saved += self.matrix.wire_size - len(payload)
+        if not payload:
+            self.skipped_uploads += 1
+            return
+
+        self._draw(payload)
+        self.uploads += 1
+        self.bytes_sent += len(payload)
+
+    def draw_full(self) -> None:
+        """
+        Upload every row, e.g. after the device was reconnected or another client drew on it
+        """
+        self.matrix.invalidate()
+        self.draw()
+
+    def draw_fb_or(self) -> None:
+        self.matrix.merge_fb_or()
+        self.draw()
+
+    def upload_stats(self) -> dict[str, int]:
+        """
+        Matrix upload counters
+
+        :return: Uploads done/skipped and bytes sent/saved by delta uploads
+        :rtype: dict
+        """
+        return {
+            'uploads': self.uploads,
+            'skipped_uploads': self.skipped_uploads,
+            'bytes_sent': self.bytes_sent,
+            'bytes_saved': self.bytes_saved,
+        }
+
+    def set_key(self, column_id: int, rgb: bytes, row_id: int = 0) -> None:  # Not needed on mice
+        if self.has('led_single'):
+            if isinstance(rgb, (tuple, list)) and len(rgb) == 3 and all([isinstance(component, int) for component in rgb]):
+                if row_id < self._matrix_dims[0] and column_id < self._matrix_dims[1]:
+                    self._lighting_dbus.setKey(row_id, column_id, [clamp_ubyte(component) for component in rgb])
+                else:
+                    raise ValueError("Row or column out of bounds. Max dimensions are: {0},{1}".format(*self._matrix_dims))
+            else:
+                raise ValueError("RGB must be an RGB tuple")
+
+    def set_keys(self, keys, colors=None) -> None:
+        """
+        Set many keys at once and upload them with a single draw()
+
+        Instead of one setKey call per key, the changed rows go out as one setKeyRow
+        payload followed by one setCustom.
+
+        :param keys: Iterable of (row, col, rgb) tuples, or an (N, 2) array of (row, col) when colors is given
+        :type keys: iterable or numpy.ndarray
+
+        :param colors: (N, 3) array of RGB components matching keys
+        :type colors: numpy.ndarray or None
+
+        :raises ValueError: If keys/colors are malformed or out of bounds
+        """
+        if colors is None:
+            updates = list(keys)
+            if not updates:
+                return
+            try:
+                index = _np.array([(row, col) for row, col, _ in updates], dtype=_np.intp)
+                colors = _np.array([rgb for _, _, rgb in updates])
+            except (TypeError, ValueError):
+                raise ValueError("Keys must be (row, col, rgb) tuples")
+        else:
+            index = _np.asarray(keys, dtype=_np.intp).reshape(-1, 2)
+            colors = _np.asarray(colors)
+
+        if colors.ndim != 2 or colors.shape != (len(index), 3) or not _np.issubdtype(colors.dtype, _np.integer):
+            raise ValueError("Colors must be one RGB integer triple per key")
+        if len(index) == 0:
+            return
+        if index.min() < 0 or (index >= _np.array(self._matrix_dims)).any():
+            raise ValueError("Row or column out of bounds. Max dimensions are: {0},{1}".format(*self._matrix_dims))
+
+        self.matrix._matrix[:, index[:, 0], index[:, 1]] = _np.clip(colors, 0, 255).astype(_np.uint8).T
+        self.draw()
+
+    def restore(self) -> None:
+        """
+        Restore the device to the last effect
+        """
+        self._lighting_dbus.restoreLastEffect()
+        # The custom frame is gone on the device, the next draw has to send everything
+        self.matrix.invalidate()
+
+
+class Frame(object):
+    """
+    Class to represent the RGB matrix of the keyboard. So to animate you'd use multiple frames
+    """
+    _matrix: _npt.NDArray[_np.uint8]
+    _fb1: _npt.NDArray[_np.uint8]
+    _wire: _npt.NDArray[_np.uint8]
+    _wire_pixels: _npt.NDArray[_np.uint8]
+    _sent: _npt.NDArray[_np.uint8] | None
+
+    def __init__(self, dimensions: tuple[int, int]):
+        self._rows, self._cols = dimensions
+        self._components = 3
+
+        self._init()
+
+    # Index with row, col OR y, x
+    def __getitem__(self, key: tuple[int, int]) -> tuple[int, int, int]:
+        """
+        Method to allow a slice to get an RGB tuple
+
+        :param key: Key, must be y,x tuple
+        :type key: tuple
+
+        :return: RGB tuple
+        :rtype: tuple
+
+        :raises AssertionError: If key is invalid
+        """
+        assert isinstance(key, tuple), "Key is not a tuple"
+        assert 0 <= key[0] < self._rows, "Row out of bounds"
+        assert 0 <= key[1] < self._cols, "Column out of bounds"
+
+        return tuple(self._matrix[:, key[0], key[1]])
+
+    # Index with row, col OR y, x
+    def __setitem__(self, key: tuple[int, int], rgb: tuple[int, int, int]) -> None:
+        """
+        Method to allow a slice to set an RGB tuple
+
+        :param key: Key, must be y,x tuple
+        :type key: tuple
+
+        :param rgb: RGB tuple
+        :type rgb: tuple
+
+        :raises AssertionError: If key is invalid
+        """
+        assert isinstance(key, tuple), "Key is not a tuple"
+        assert 0 <= key[0] < self._rows, "Row out of bounds"
+        assert 0 <= key[1] < self._cols, "Column out of bounds"
+        assert isinstance(rgb, (list, tuple)) and len(rgb) == 3, "Value must be a tuple,list of 3 RGB components"
+
+        self._matrix[:, key[0], key[1]] = rgb
+
+    def __bytes__(self) -> bytes:
+        """
+        When bytes() is ran on the class will return a binary capable of being sent to the driver
+
+        :return: Driver binary payload
+        :rtype: bytes
+        """
+        return bytes(self.wire_buffer())
+
+    def _init(self) -> None:
+        self._matrix = _np.zeros((self._components, self._rows, self._cols), 'uint8')
+        self._fb1 = _np.copy(self._matrix)
+
+        # Driver payload, one line per row: row id, start col, end col, then RGB triplets.
+        # Headers never change, so they are written once here.
+        self._wire = _np.zeros((self._rows, 3 + self._cols * self._components), 'uint8')
+        self._wire[:, 0] = _np.arange(self._rows)
+        self._wire[:, 1] = 0
+        self._wire[:, 2] = self._cols - 1
+        self._wire_pixels = self._wire[:, 3:].reshape(self._rows, self._cols, self._components)
+
+        # Copy of the last uploaded wire buffer, None forces a full upload
+        self._sent = None
+
+    @property
+    def wire_size(self) -> int:
+        """
+        Size of a full driver payload in bytes
+
+        :return: Bytes
+        :rtype: int
+        """
+        return self._wire.nbytes
+
+    def wire_buffer(self) -> memoryview:
+        """
+        Serialize the matrix into the preallocated wire buffer
+
+        A single transpose-assign copies the pixels; the returned memoryview shares
+        memory with the buffer and stays valid until the next call.
+
+        :return: Driver binary payload
+        :rtype: memoryview
+        """
+        self._wire_pixels[...] = self._matrix.transpose(1, 2, 0)
+        return memoryview(self._wire).cast('B')
+
+    def reset(self) -> None:
+        """
+        Init/Clear the matrix
+        """
+        if self._matrix is None:
+            self._init()
+        else:
+            self._matrix.fill(0)
+
+    def set(self, y: int, x: int, rgb: tuple[int, int, int]) -> None:
+        """
+        Method to allow a slice to set an RGB tuple
+
+        :param y: Row
+        :type y: int
+
+        :param x: Column
+        :type x: int
+
+        :param rgb: RGB tuple
+        :type rgb: tuple
+
+        :raises AssertionError: If key is invalid
+        """
+        self.__setitem__((y, x), rgb)
+
+    def get(self, y: int, x: int) -> tuple[int, int, int]:
+        """
+        Method to allow a slice to get an RGB tuple
+
+        :param y: Row
+        :type y: int
+
+        :param x: Column
+        :type x: int
+
+        :return rgb: RGB tuple
+        :return rgb: tuple
+
+        :raises AssertionError: If key is invalid
+        """
+        return self.__getitem__((y, x))
+
+    def delta_binary(self) -> bytes:
+        """
+        Get the payload of all rows that changed since the last call
+
+        The first call after creation or invalidate() returns every row.
+
+        :return: Driver binary payload, empty if nothing changed
+        :rtype: bytes
+        """
+        wire = self.wire_buffer()
+        if self._sent is None:
+            self._sent = _np.copy(self._wire)
+            return bytes(wire)
+
+        dirty = _np.flatnonzero((self._wire != self._sent).any(axis=1))
+        self._sent[dirty] = self._wire[dirty]
+        return self._wire[dirty].tobytes()
+
+    def invalidate(self) -> None:
+        """
+        Forget what was uploaded, so the next delta_binary() returns every row
+        """
+        self._sent = None
+
+    def row_binary(self, row_id: int) -> bytes:
+        """
+        Get binary payload for 1 row which is compatible with the driver
+
+        :param row_id: Row ID
+        :type row_id: int
+
+        :return: Binary payload
+        :rtype: bytes
+        """
+        assert 0 <= row_id < self._rows, "Row out of bounds"
+
+        self._wire_pixels[row_id] = self._matrix[:, row_id].T
+        return self._wire[row_id].tobytes()
+
+    def to_binary(self) -> bytes:
+        """
+        Get the whole binary for the keyboard to be sent to the driver.
+
+        :return: Driver binary payload
+        :rtype: bytes
+        """
+        return bytes(self)
+
+    # Simple FB
+    # For more than one extra buffer see razer_control.core.layers.LayerStack
+    def to_framebuffer(self) -> None:
+        _np.copyto(self._fb1, self._matrix)
+
+    def to_framebuffer_or(self) -> None:
+        _np.bitwise_or(self._fb1, self._matrix, out=self._fb1)  # pylint: disable=no-member
+
+    def merge_fb_or(self) -> None:
+        """
+        OR the framebuffer into the matrix in place, without serializing it
+        """
+        _np.bitwise_or(self._fb1, self._matrix, out=self._matrix)  # pylint: disable=no-member
+
+    def draw_with_fb_or(self) -> bytes:
+        self.merge_fb_or()
+        return bytes(self)
@@ -0,0 +1,57 @@
+import json
+import logging
+import os
+
+from razer_control.core.atomic_file import write_json_atomic
+
+PROFILE_KEYS = ('effect', 'r', 'g', 'b', 'brightness')
+LAST_PROFILE = 'last'  # written by the GUI on exit
+
+
+def default_profile_path():
+    """$XDG_CONFIG_HOME/razer-control/profiles.json (~/.config if XDG_CONFIG_HOME is unset)."""
+    config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+    return os.path.join(config_home, 'razer-control', 'profiles.json')
+
+
+class ProfileStore:
+    """Named lighting profiles (effect, color and brightness per device serial) in one small JSON file."""
+
+    def __init__(self, path=None):
+        self.path = path or default_profile_path()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f).get('profiles', {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not read profiles from {self.path}: {e}")
+            return {}
+
+    def _write(self, profiles):
+        """Replace the file atomically, so a crash never leaves half a file."""
+        write_json_atomic(self.path, {'version': 1, 'profiles': profiles}, prefix='.profiles-',
+                          separators=(',', ':'), sort_keys=True)
+
+    def names(self):
+        return sorted(self._read())
+
+    def load(self, name):
+        """Return {serial: state} for a profile, or None if it does not exist."""
+        return self._read().get(name)
+
+    def save(self, name, states):
+        """Store {serial: state}; only the keys in PROFILE_KEYS are kept."""
+        profiles = self._read()
+        profiles[name] = {
+            serial: {key: state[key] for key in PROFILE_KEYS if key in state}
+            for serial, state in states.items() if state
+        }
+        self._write(profiles)
+
+    def delete(self, name):
+        profiles = self._read()
+        if profiles.pop(name, None) is not None:
+            self._write(profiles)
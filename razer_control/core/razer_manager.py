@@ -1,97 +1,496 @@
 import logging
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout
 from openrazer.client import DeviceManager
 from openrazer.client import constants as razer_constants
 from razer_control.core.fx import RazerFX
+from razer_control.core.dbus_pool import dbus_pool
+from razer_control.core.device_registry import DeviceRegistry
+from razer_control.core.write_scheduler import WriteScheduler
+from razer_control.core.animation import AnimationEngine
+from razer_control.core.profiles import ProfileStore
+from razer_control.core.instrumentation import instrumentation, ALL_DEVICES
+from razer_control.core.device_executor import DeviceExecutor, glib_dispatch
+
+
+def _open_device(serial):
+    """Open a single device through the openrazer client, without building a whole DeviceManager."""
+    from openrazer.client.device import RazerDeviceFactory
+    return RazerDeviceFactory.get_device(serial)
+
 
 class RazerManager:
     """Manages Razer devices and synchronizes UI effect names with hardware capabilities."""
+
+    STATE_TTL = 30.0  # Sekunden, danach wird der Zustand erneut von der Hardware gelesen
+    COLOR_EFFECTS = ('static', 'breathSingle', 'reactive')
+    BROADCAST_TIMEOUT = 2.0  # Sekunden für alle Geräte zusammen
+    WRITE_DEDUP_WINDOW = 1.0  # Sekunden, in denen ein wiederholter gleicher Befehl verworfen wird
     
-    def __init__(self):
-        self.devices = []
+    def __init__(self, dispatch=glib_dispatch, pipelined_reads=False, watch_hotplug=True, profiles=None,
+                 device_manager_factory=DeviceManager, device_factory=_open_device):
+        self.devices = DeviceRegistry()
+        self._device_manager_factory = device_manager_factory # z.B. MockDeviceManager für Benchmarks
+        self._device_factory = device_factory # serial -> openrazer Device, für Hotplug
+        self.pipelined_reads = pipelined_reads # Benötigt eine D-Bus Mainloop (DBusGMainLoop)
         self._cap_map = {
             'breathSingle': 'breath_single',
             'breathRandom': 'breath_random',
             'breathDual':   'breath_dual'
         }
+        self.write_scheduler = WriteScheduler()
+        self.executor = DeviceExecutor(dispatch)
+        self._dispatch = dispatch
+        self._state_cache = {}  # serial -> (timestamp, state)
+        self._applied = {}  # serial -> {'effect'|'brightness': (timestamp, command)}, zuletzt von uns geschriebene Befehle
+        self._state_lock = threading.Lock()
+        self._pending_fetches = {}  # serial -> callbacks, die auf den laufenden fetch_state warten
+        self._device_listeners = []
+        self._animations = {}  # serial -> AnimationEngine
+        self.profiles = profiles or ProfileStore()
         self.re_scan()
+        if watch_hotplug:
+            self._watch_hotplug()
 
-    def get_current_state(self, device_serial=None):
-        """Fetch state for a specific device by serial, or the first one if None."""
-        target_dev = next((d for d in self.devices if d['fx']._serial == device_serial), None)
-        if not target_dev:
-            target_dev = self.devices[0] if self.devices else None
-        
+    def get_current_state(self, device_serial=None, refresh=False):
+        """Fetch state for a specific device by serial, or the first one if None.
+
+        Served from the per-device cache unless it is older than STATE_TTL or refresh is set.
+        Returns None if there is no device or the hardware could not be read.
+        """
+        target_dev = self._find_device(device_serial)
         if not target_dev: return None
+
+        serial = target_dev.serial
+        if not refresh:
+            cached = self._cached_state(serial)
+            if cached:
+                return cached
         
-        fx = target_dev['fx']
-        raw_device = target_dev['raw'] # Zugriff auf das echte Device-Objekt
+        fx = target_dev.fx
+        raw_device = target_dev.raw # Zugriff auf das echte Device-Objekt
         try:
-            rgb = list(fx.colors)
-            return {
-                'effect': fx.effect, 
-                'r': rgb[0], 'g': rgb[1], 'b': rgb[2],
-                'brightness': raw_device.brightness # Helligkeit auslesen
-            }
+            with instrumentation.timed(serial, 'manager.get_current_state'):
+                rgb = list(fx.colors)
+                state = {
+                    'effect': fx.effect, 
+                    'r': rgb[0], 'g': rgb[1], 'b': rgb[2],
+                    'brightness': raw_device.brightness # Helligkeit auslesen
+                }
+        except Exception as e:
+            logging.warning(f"Could not read state of {target_dev.name}: {e}")
+            return None
+
+        return self._store_state(serial, state)
+
+    def _find_device(self, device_serial):
+        """Return the device record for a serial, falling back to the first device."""
+        return self.devices.get(device_serial) or self.devices.first()
+
+    def _cached_state(self, serial):
+        with self._state_lock:
+            cached = self._state_cache.get(serial)
+        if cached and time.monotonic() - cached[0] < self.STATE_TTL:
+            return dict(cached[1])
+        return None
+
+    def _store_state(self, serial, state):
+        """Cache state read from the hardware."""
+        with self._state_lock:
+            self._state_cache[serial] = (time.monotonic(), state)
+        return dict(state)
+
+    def invalidate_state(self, device_serial=None):
+        """Drop cached state and remembered writes for one device, or for all devices if serial is None."""
+        with self._state_lock:
+            if device_serial is None:
+                self._state_cache.clear()
+                self._applied.clear()
+            else:
+                self._state_cache.pop(device_serial, None)
+                self._applied.pop(device_serial, None)
+
+    def _effect_command(self, name, r, g, b):
+        """What an effect write actually sends: the color only matters for COLOR_EFFECTS."""
+        return (name, r, g, b) if name in self.COLOR_EFFECTS else (name,)
+
+    def _write_through(self, dev, slot, command, write, force=False):
+        """Call write() unless it repeats our previous write to this slot within WRITE_DEDUP_WINDOW.
+
+        Repeats are dropped and counted as 'writes.dropped.<slot>'. The window is short, so a
+        change made by another tool is overwritten by the next write; force skips the check.
+        A failed write forgets the slot.
+        """
+        serial = dev.serial
+        with self._state_lock:
+            applied = self._applied.get(serial, {}).get(slot)
+        if (not force and applied and applied[1] == command
+                and time.monotonic() - applied[0] < self.WRITE_DEDUP_WINDOW):
+            instrumentation.count(serial, f"writes.dropped.{slot}")
+            return
+
+        try:
+            write()
         except Exception:
-            return {'effect': 'none', 'r': 0, 'g': 0, 'b': 0, 'brightness': 100}
+            with self._state_lock:
+                self._applied.get(serial, {}).pop(slot, None)
+            raise
+        with self._state_lock:
+            self._applied.setdefault(serial, {})[slot] = (time.monotonic(), command)
+        instrumentation.count(serial, f"writes.applied.{slot}")
+
+    def _forget_write(self, serial, slot):
+        with self._state_lock:
+            self._applied.get(serial, {}).pop(slot, None)
+
+    def _update_cached_state(self, serial, **changes):
+        """Apply our own writes to the cache so it stays valid without a read-back."""
+        with self._state_lock:
+            cached = self._state_cache.get(serial)
+            if cached:
+                cached[1].update(changes)
         
     def re_scan(self):
         """Re-initialize the device list from the hardware daemon."""
         try:
-            self._raw_manager = DeviceManager()
-            self._raw_manager.sync_effects = False
-            
-            self.devices = []
-            for device in self._raw_manager.devices:
-                self.devices.append({
-                    'fx': RazerFX(device.serial, device.capabilities),
-                    'raw': device, # Speichern für Brightness-Zugriff
-                    'name': device.name
-                })
+            with instrumentation.timed(ALL_DEVICES, 'manager.re_scan'):
+                self._raw_manager = self._device_manager_factory()
+                self._raw_manager.sync_effects = False
+                
+                self.devices.clear()
+                self.invalidate_state()
+                for device in self._raw_manager.devices:
+                    self._add_device(device)
             
             logging.info(f"Rescan complete. Found {len(self.devices)} devices.")
         except Exception as e:
             logging.error(f"Failed to rescan Razer devices: {e}")
 
-    def set_brightness(self, value, device_serial=None):
-        """Set brightness (0-100) for a specific device or all."""
-        for dev in self.devices:
-            if device_serial and dev['fx']._serial != device_serial:
-                continue
+    def _add_device(self, device):
+        # raw: das openrazer Device, wird für Brightness-Zugriff benötigt
+        return self.devices.add(device.serial, device.name, self._make_fx(device), device)
+
+    @staticmethod
+    def _make_fx(device):
+        """Build our RazerFX, with matrix dimensions so fx.advanced exists on per-key devices."""
+        matrix_dims = (-1, -1)
+        try:
+            if device.has('lighting_led_matrix') and device.fx.advanced:
+                matrix_dims = (device.fx.advanced.rows, device.fx.advanced.cols)
+        except Exception as e:
+            logging.warning(f"Could not read matrix dimensions of {device.name}: {e}")
+        return RazerFX(device.serial, device.capabilities, matrix_dims=matrix_dims)
+
+    def start_animation(self, device_serial, render, fps=30.0):
+        """Run render(frame, t) on the device's key matrix at fps. Returns the engine, or None without a matrix."""
+        dev = self.devices.get(device_serial)
+        if not dev or not dev.fx.advanced:
+            return None
+
+        restored = self.stop_animation(device_serial)
+        if restored is not None:
+            # restore() invalidates the frame, it must not land between the new engine's draws
             try:
-                dev['raw'].brightness = value
+                restored.result(timeout=self.BROADCAST_TIMEOUT)
+            except FuturesTimeout:
+                logging.warning(f"Could not start animation on {dev.name}: previous animation still being restored")
+                return None
             except Exception as e:
-                logging.error(f"Could not set brightness for {dev['name']}: {e}")
+                logging.error(f"Could not restore {dev.name} before the new animation: {e}")
+        self._forget_write(device_serial, 'effect') # Frames überschreiben den Effekt
+        engine = AnimationEngine(dev.fx.advanced, render, fps)
+        self._animations[device_serial] = engine
+        engine.start()
+        return engine
+
+    def stop_animation(self, device_serial):
+        """Stop a running animation and hand the device back to its last hardware effect.
+
+        Returns the future of the restore on the device worker, or None if nothing was running.
+        """
+        engine = self._animations.pop(device_serial, None)
+        if engine:
+            engine.stop()
+            self._forget_write(device_serial, 'effect')
+            return self.executor.submit(device_serial, self._restore_after, engine)
+        return None
+
+    @staticmethod
+    def _restore_after(engine):
+        """Runs on the device worker: restore only once the render thread is gone, so no late frame lands on top."""
+        engine.join()
+        engine.advanced_fx.restore()
+
+    def connect_devices_changed(self, callback):
+        """Register callback(added, removed) for hotplug changes. Both are lists of DeviceRecords."""
+        self._device_listeners.append(callback)
 
-    def set_effect(self, name, r=0, g=0, b=0, device_serial=None):
-        """Apply effect to a specific device or all if serial is None."""
-        for dev in self.devices:
-            if device_serial and dev['fx']._serial != device_serial:
+    def _watch_hotplug(self):
+        """Subscribe to the daemon's device_added/device_removed signals (needs a D-Bus main loop)."""
+        try:
+            for signal in ('device_added', 'device_removed'):
+                dbus_pool.bus.add_signal_receiver(
+                    self._on_hotplug, signal_name=signal,
+                    dbus_interface='razer.devices', bus_name='org.razer', path='/org/razer'
+                )
+        except Exception as e:
+            logging.warning(f"Hotplug detection unavailable: {e}")
+
+    def _on_hotplug(self, *args):
+        self.executor.submit(None, self._diff_devices, callback=self._apply_device_diff)
+
+    def _diff_devices(self):
+        """Runs on a worker: compare the daemon's serials with ours and open only the new devices."""
+        daemon = dbus_pool.get_interface(dbus_pool.get_object('org.razer', '/org/razer'), 'razer.devices')
+        serials = [str(serial) for serial in daemon.getDevices()]
+
+        removed = [serial for serial in self.devices.serials() if serial not in serials]
+        added = []
+        for serial in serials:
+            if serial in self.devices:
                 continue
-                
-            fx = dev['fx']
-            cap_name = self._cap_map.get(name, name)
-            if not fx.has(cap_name): continue
-
-            if name == 'static': fx.static(r, g, b)
-            elif name == 'breathSingle': fx.breath_single(r, g, b)
-            elif name == 'breathRandom': fx.breath_random()
-            elif name == 'spectrum': fx.spectrum()
-            elif name == 'wave': fx.wave(razer_constants.WAVE_RIGHT)
-            elif name == 'reactive': fx.reactive(r, g, b, razer_constants.REACTIVE_1000MS)
-            elif name == 'none': fx.none()  
+            try:
+                device = self._device_factory(serial)
+            except Exception as e:
+                logging.error(f"Could not open hotplugged device {serial}: {e}")  # next signal retries
+                continue
+            added.append((device, self._make_fx(device)))
+        return added, removed
+
+    def _apply_device_diff(self, diff):
+        """Runs on the UI thread: apply a hotplug diff to self.devices and notify listeners."""
+        # Diffs queued back to back may overlap, so re-check against the current registry
+        removed = [self.devices.remove(serial) for serial in diff[1] if serial in self.devices]
+        for record in removed:
+            if engine := self._animations.pop(record.serial, None):
+                engine.stop()
+            self.invalidate_state(record.serial)
+            self.executor.remove(record.serial)
+            dbus_pool.release(f"/org/razer/device/{record.serial}")
+
+        added = [
+            self.devices.add(device.serial, device.name, fx, device)
+            for device, fx in diff[0] if device.serial not in self.devices
+        ]
+        if not added and not removed:
+            return
+
+        logging.info(f"Hotplug: {len(added)} added, {len(removed)} removed.")
+        for callback in self._device_listeners:
+            callback(added, removed)
+
+    def set_brightness(self, value, device_serial=None, force=False):
+        """Set brightness (0-100) for a specific device, or for all in parallel if serial is None.
+
+        force writes even if the same value was just written, see _write_through.
+        Returns a report {serial: 'ok' | 'unsupported' | 'error: ...'} either way, see broadcast.
+        """
+        if device_serial is None:
+            return self.broadcast(self._set_brightness_on, value, force)
+        return self._run_on(device_serial, self._set_brightness_on, value, force)
+
+    def _set_brightness_on(self, dev, value, force=False):
+        def _write():
+            with instrumentation.timed(dev.serial, 'manager.set_brightness'):
+                dev.raw.brightness = value
+
+        self._write_through(dev, 'brightness', value, _write, force)
+        self._update_cached_state(dev.serial, brightness=value)
+        return True
+
+    def broadcast(self, command, *args, timeout=None):
+        """Run command(device, *args) on every device's worker at once.
+
+        Waits at most timeout seconds (BROADCAST_TIMEOUT by default) in total and returns
+        a report {serial: 'ok' | 'unsupported' | 'timeout' | 'error: ...'}. A hung device
+        only delays its own entry; the others have been applied already.
+        """
+        futures = {dev.serial: self.executor.submit(dev.serial, command, dev, *args) for dev in self.devices}
+        deadline = time.monotonic() + (self.BROADCAST_TIMEOUT if timeout is None else timeout)
+
+        report = {}
+        for serial, future in futures.items():
+            try:
+                applied = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                report[serial] = 'ok' if applied else 'unsupported'
+            except FuturesTimeout:
+                report[serial] = 'timeout'
+                instrumentation.count(serial, 'broadcast.timeout')
+                logging.warning(f"Broadcast {command.__name__} timed out for {serial}")
+            except Exception as e:
+                report[serial] = f"error: {e}"
+                instrumentation.count(serial, 'broadcast.error')
+        return report
+
+    def _run_on(self, device_serial, command, *args):
+        """Run command(device, *args) for one device on the calling thread; returns a report like broadcast."""
+        report = {}
+        for dev in self.devices.select(device_serial):
+            try:
+                report[dev.serial] = 'ok' if command(dev, *args) else 'unsupported'
+            except Exception as e:
+                report[dev.serial] = f"error: {e}"
+                logging.error(f"{command.__name__} failed for {dev.name}: {e}")
+        return report
+
+    def schedule_brightness(self, value, device_serial=None):
+        """Coalesce rapid brightness changes (e.g. slider drags) and apply only the latest value."""
+        self.write_scheduler.submit(
+            device_serial, 'brightness', value,
+            lambda v: self.set_brightness_async(v, device_serial=device_serial)
+        )
+
+    def get_current_state_async(self, device_serial=None, callback=None):
+        """Read the device state without blocking and hand it to callback on the UI thread.
+
+        With pipelined_reads all reads go out at once (see fetch_state), otherwise
+        they run one after another on the device worker thread.
+        """
+        if self.pipelined_reads:
+            self.fetch_state(device_serial, callback)
+            return None
+        return self.executor.submit(device_serial, self.get_current_state, device_serial, callback=callback)
+
+    def fetch_state(self, device_serial=None, callback=None):
+        """Fetch effect, colors, brightness and name in a single pipelined D-Bus round trip.
+
+        Must be called from the thread running the D-Bus main loop; callback is invoked there.
+        Calls for a device whose fetch is still in flight wait for that reply instead of sending their own.
+        """
+        target_dev = self._find_device(device_serial)
+        if not target_dev:
+            self._dispatch(callback, None)
+            return
+
+        serial = target_dev.serial
+        cached = self._cached_state(serial)
+        if cached:
+            self._dispatch(callback, cached)
+            return
+
+        with self._state_lock:
+            waiting = self._pending_fetches.get(serial)
+            if waiting is not None:
+                waiting.append(callback)
+                return
+            self._pending_fetches[serial] = [callback]
+
+        start = time.perf_counter()
+
+        def _answer(state):
+            with self._state_lock:
+                callbacks = self._pending_fetches.pop(serial, [])
+            for waiting_callback in callbacks:
+                if waiting_callback:
+                    waiting_callback(dict(state) if state else None)
+
+        def _on_reply(result):
+            instrumentation.record(serial, 'manager.fetch_state', time.perf_counter() - start)
+            rgb = list(result['colors']) + [0, 0, 0]
+            state = self._store_state(serial, {
+                'effect': result['effect'],
+                'r': rgb[0], 'g': rgb[1], 'b': rgb[2],
+                'brightness': result['brightness'],
+                'name': result['name']
+            })
+            _answer(state)
+
+        def _on_error(e):
+            instrumentation.record(serial, 'manager.fetch_state', time.perf_counter() - start, error=True)
+            logging.warning(f"Could not fetch state for {target_dev.name}: {e}")
+            _answer(None)
+
+        try:
+            target_dev.fx.fetch_state(_on_reply, _on_error)
+        except Exception as e:
+            _on_error(e)
+
+    def set_brightness_async(self, value, device_serial=None, callback=None, force=False):
+        """Non-blocking variant of set_brightness."""
+        return self.executor.submit(device_serial, self.set_brightness, value, device_serial, force, callback=callback)
+
+    def set_effect_async(self, name, r=0, g=0, b=0, device_serial=None, callback=None, force=False):
+        """Non-blocking variant of set_effect."""
+        return self.executor.submit(
+            device_serial, self.set_effect, name, r, g, b, device_serial, force, callback=callback
+        )
+
+    def set_effect(self, name, r=0, g=0, b=0, device_serial=None, force=False):
+        """Apply effect to a specific device, or to all in parallel if serial is None.
+
+        force writes even if the same effect was just written, see _write_through.
+        Returns a report {serial: 'ok' | 'unsupported' | 'error: ...'} either way, see broadcast.
+        """
+        if device_serial is None:
+            return self.broadcast(self._set_effect_on, name, r, g, b, force)
+        return self._run_on(device_serial, self._set_effect_on, name, r, g, b, force)
+
+    def _set_effect_on(self, dev, name, r, g, b, force=False):
+        fx = dev.fx
+        cap_name = self._cap_map.get(name, name)
+        if not fx.has(cap_name): return False
+
+        def _write():
+            with instrumentation.timed(dev.serial, 'manager.set_effect'):
+                if name == 'static': fx.static(r, g, b)
+                elif name == 'breathSingle': fx.breath_single(r, g, b)
+                elif name == 'breathRandom': fx.breath_random()
+                elif name == 'spectrum': fx.spectrum()
+                elif name == 'wave': fx.wave(razer_constants.WAVE_RIGHT)
+                elif name == 'reactive': fx.reactive(r, g, b, razer_constants.REACTIVE_1000MS)
+                elif name == 'none': fx.none()  
+
+        self._write_through(dev, 'effect', self._effect_command(name, r, g, b), _write, force)
+
+        if name in self.COLOR_EFFECTS:
+            self._update_cached_state(dev.serial, effect=name, r=r, g=g, b=b)
+        else:
+            self._update_cached_state(dev.serial, effect=name)
+        return True
+
+    def save_profile(self, name):
+        """Store the current effect, color and brightness of every device as a named profile.
+
+        Devices whose state cannot be read keep their entry from the previous version of the profile.
+        """
+        states = {dev.serial: self.get_current_state(dev.serial) for dev in self.devices}
+        failed = [serial for serial, state in states.items() if state is None]
+        if failed:
+            logging.warning(f"Not saving unreadable devices in profile {name}: {', '.join(failed)}")
+            previous = self.profiles.load(name) or {}
+            states.update({serial: previous[serial] for serial in failed if serial in previous})
+        self.profiles.save(name, states)
+        return states
+
+    def apply_profile(self, name, timeout=None):
+        """Push a stored profile to all devices in parallel. Returns the broadcast report, or None if unknown."""
+        profile = self.profiles.load(name)
+        if profile is None:
+            logging.error(f"Profile {name} not found")
+            return None
+        return self.broadcast(self._apply_profile_on, profile, timeout=timeout)
+
+    def _apply_profile_on(self, dev, profile):
+        state = profile.get(dev.serial)
+        if not state:
+            return False
+
+        # Always written: the profile is meant to win over whatever is on the device now
+        applied = self._set_effect_on(dev, state.get('effect', 'none'), state.get('r', 0), state.get('g', 0), state.get('b', 0), force=True)
+        if 'brightness' in state:
+            self._set_brightness_on(dev, state['brightness'], force=True)
+            applied = True
+        return applied
 
     def get_all_supported_effects(self, device_serial=None):
         """Return effects supported by a specific device or all devices."""
         possible = ['static', 'breathSingle', 'breathRandom', 'spectrum', 'wave', 'reactive', 'none']
         supported = set()
 
-        for dev in self.devices:
-            if device_serial and dev['fx']._serial != device_serial:
-                continue
-                
+        for dev in self.devices.select(device_serial):
             for eff in possible:
-                if dev['fx'].has(self._cap_map.get(eff, eff)):
+                if dev.fx.has(self._cap_map.get(eff, eff)):
                     supported.add(eff)
                     
         return sorted(list(supported))
\ No newline at end of file
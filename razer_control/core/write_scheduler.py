@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+
+
+class WriteScheduler:
+    """
+    Coalesces rapid hardware writes per (device, property) and flushes them at a bounded rate.
+
+    If write_fn returns a future (e.g. from DeviceExecutor.submit), at most one write per
+    (device, property) is in flight; newer values wait until it completes and only the latest is sent.
+    """
+
+    def __init__(self, max_rate=20.0):
+        self.max_rate = max_rate
+        self._lock = threading.Lock()
+        self._pending = {}   # (serial, prop) -> (value, write_fn)
+        self._last_flush = {}  # (serial, prop) -> monotonic timestamp
+        self._timers = {}    # (serial, prop) -> threading.Timer
+        self._in_flight = {}  # (serial, prop) -> future of the running write
+
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+
+    @property
+    def min_interval(self):
+        """Minimum time in seconds between two writes of the same property."""
+        return 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+
+    def submit(self, serial, prop, value, write_fn):
+        """Queue a write. Only the latest value per (serial, prop) is kept until the next flush."""
+        key = (serial, prop)
+        with self._lock:
+            self.submitted += 1
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = (value, write_fn)
+            flush_now = self._schedule(key)
+
+        if flush_now:
+            self._flush_key(key)
+
+    def flush(self):
+        """Write all pending values immediately, e.g. before shutdown, even if a write is still in flight."""
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self._flush_key(key, force=True)
+
+    def stats(self):
+        """Return counters describing how many writes were submitted, written and coalesced."""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'coalesced': self.coalesced,
+                'pending': len(self._pending),
+            }
+
+    def _schedule(self, key):
+        """Arm the flush timer for key. Returns True if it should be flushed right away. Caller holds the lock."""
+        if key in self._timers or key in self._in_flight:
+            return False  # the timer or the write's completion picks up the pending value
+
+        wait = self._last_flush.get(key, 0.0) + self.min_interval - time.monotonic()
+        if wait > 0:
+            timer = threading.Timer(wait, self._flush_key, args=(key,))
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+            return False
+        return True
+
+    def _flush_key(self, key, force=False):
+        with self._lock:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            if key in self._in_flight and not force:
+                return
+            entry = self._pending.pop(key, None)
+            if entry is None:
+                return
+            self._last_flush[key] = time.monotonic()
+            self.written += 1
+
+        value, write_fn = entry
+        try:
+            result = write_fn(value)
+        except Exception as e:
+            logging.error(f"Scheduled write of {key[1]} for {key[0]} failed: {e}")
+            return
+
+        if hasattr(result, 'add_done_callback'):
+            with self._lock:
+                self._in_flight[key] = result
+            result.add_done_callback(lambda fut: self._write_done(key, fut))
+
+    def _write_done(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key) is not future:
+                return  # a forced flush has replaced it
+            del self._in_flight[key]
+            flush_now = key in self._pending and self._schedule(key)
+
+        if flush_now:
+            self._flush_key(key)
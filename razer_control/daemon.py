@@ -0,0 +1,268 @@
+"""
+Resident control daemon: keeps RazerManager and its D-Bus proxies warm and serves a
+line-delimited JSON protocol on a Unix socket.
+
+Request:  {"id": 1, "cmd": "set-effect", "effect": "static", "color": [255, 0, 0], "device": "SERIAL"}
+Response: {"id": 1, "ok": true, "result": ...}  or  {"id": 1, "ok": false, "error": "..."}
+
+set-effect and set-brightness answer with a report {serial: "ok" | "unsupported" | "error: ..."};
+with "device" set they fail unless that device reported "ok". apply-profile and
+save-profile always cover every device and ignore "device".
+
+Clients may pipeline: every line is dispatched as soon as it is read, device commands
+run on that device's worker, and responses are written as they complete. Responses of
+different devices can therefore arrive out of order; match them by "id".
+
+Commands: ping, list, state, set-effect, set-brightness, apply-profile, save-profile, stats, dump-stats
+"""
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from razer_control.cli import EFFECTS
+from razer_control.core.instrumentation import instrumentation, default_dump_path
+
+
+def default_socket_path():
+    """$XDG_RUNTIME_DIR/razer-control.sock, or a per-user path in /tmp."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'razer-control.sock')
+    return f"/tmp/razer-control-{os.getuid()}.sock"
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # Responses are written by one thread per connection, never by the device worker that
+        # produced them: a client that does not read would otherwise block that device for everyone.
+        self._outbox = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_responses, name="razer-control-writer", daemon=True)
+        self._writer.start()
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self._respond(None, error=f"invalid JSON: {e}")
+                continue
+            self.server.control.dispatch(request, self._respond)
+
+    def finish(self):
+        self._outbox.put(None)  # responses queued so far are still written
+        self._writer.join()
+        super().finish()
+
+    def _respond(self, request_id, result=None, error=None):
+        if error is None:
+            message = {'id': request_id, 'ok': True, 'result': result}
+        else:
+            message = {'id': request_id, 'ok': False, 'error': error}
+        self._outbox.put((json.dumps(message, separators=(',', ':'), default=str) + '\n').encode())
+
+    def _write_responses(self):
+        while (data := self._outbox.get()) is not None:
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                return  # client went away
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlDaemon:
+    """Maps protocol commands onto a long-lived RazerManager."""
+
+    INLINE = ('ping', 'list', 'stats', 'dump-stats')  # answered on the connection thread, no D-Bus involved
+    ALL_DEVICES = ('apply-profile', 'save-profile')  # span every device, so they run on the broadcast worker
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.requests = 0
+        self.errors = 0
+
+    def dispatch(self, request, respond):
+        """Handle one request; respond(id, result=..., error=...) is called exactly once, possibly later."""
+        self.requests += 1
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            handler = self._handlers[request['cmd']]
+        except (KeyError, TypeError):
+            self.errors += 1
+            respond(request_id, error=f"unknown command: {request.get('cmd') if isinstance(request, dict) else request}")
+            return
+
+        def _on_error(e):
+            self.errors += 1
+            respond(request_id, error=str(e))
+
+        try:
+            device = request.get('device')
+            if device is not None and (not isinstance(device, str) or device not in self.manager.devices):
+                raise ValueError(f"unknown device: {device}")
+
+            if request['cmd'] in self.INLINE:
+                respond(request_id, result=handler(self, request))
+                return
+            # Hardware commands run on the device worker (or the broadcast worker for all devices).
+            # Profile commands broadcast to the device workers themselves and would wait on their own worker.
+            worker = None if request['cmd'] in self.ALL_DEVICES else device
+            self.manager.executor.submit(
+                worker, handler, self, request,
+                callback=lambda result: respond(request_id, result=result), error_callback=_on_error
+            )
+        except Exception as e:
+            _on_error(e)
+
+    def _ping(self, request):
+        return 'pong'
+
+    def _list(self, request):
+        return [
+            {'id': dev.id, 'serial': dev.serial, 'name': dev.name,
+             'effects': self.manager.get_all_supported_effects(dev.serial)}
+            for dev in self.manager.devices
+        ]
+
+    def _stats(self, request):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'devices': len(self.manager.devices),
+            'write_scheduler': self.manager.write_scheduler.stats(),
+            'instrumentation': instrumentation.snapshot(),
+        }
+
+    def _dump_stats(self, request):
+        return instrumentation.dump(request.get('path') or default_dump_path())
+
+    def _state(self, request):
+        device = request.get('device')
+        serials = [device] if device else self.manager.devices.serials()
+        return {serial: self.manager.get_current_state(serial) for serial in serials}
+
+    def _set_effect(self, request):
+        if request.get('effect') not in EFFECTS:
+            raise ValueError(f"unknown effect: {request.get('effect')}")
+        r, g, b = request.get('color', (0, 255, 0))
+        report = self.manager.set_effect(request['effect'], int(r), int(g), int(b), device_serial=request.get('device'), force=True)
+        return self._device_report(request, report)
+
+    def _set_brightness(self, request):
+        value = float(request['value'])
+        if not 0 <= value <= 100:
+            raise ValueError(f"brightness must be between 0 and 100: {request['value']}")
+        report = self.manager.set_brightness(value, device_serial=request.get('device'), force=True)
+        return self._device_report(request, report)
+
+    @staticmethod
+    def _device_report(request, report):
+        """The report for all devices; a command for one device fails unless that device reported 'ok'."""
+        device = request.get('device')
+        if device is not None and report.get(device) != 'ok':
+            raise RuntimeError(f"{device}: {report.get(device)}")
+        return report
+
+    def _apply_profile(self, request):
+        report = self.manager.apply_profile(request['name'])
+        if report is None:
+            raise ValueError(f"unknown profile: {request['name']}")
+        return report
+
+    def _save_profile(self, request):
+        self.manager.save_profile(request['name'])
+        return request['name']
+
+    _handlers = {
+        'ping': _ping,
+        'list': _list,
+        'stats': _stats,
+        'dump-stats': _dump_stats,
+        'state': _state,
+        'set-effect': _set_effect,
+        'set-brightness': _set_brightness,
+        'apply-profile': _apply_profile,
+        'save-profile': _save_profile,
+    }
+
+
+def _bind(socket_path, manager):
+    """Create the listening server for manager on socket_path."""
+    old_umask = os.umask(0o177)  # socket is created 0600, no window for other users to connect
+    try:
+        server = _Server(socket_path, _Connection)
+    finally:
+        os.umask(old_umask)
+    server.control = ControlDaemon(manager)
+    return server
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path=None, manager=None):
+    """Run the daemon until interrupted."""
+    socket_path = socket_path or default_socket_path()
+    if manager is None:
+        from razer_control.core.device_executor import direct_dispatch
+        from razer_control.core.razer_manager import RazerManager
+        manager = RazerManager(dispatch=direct_dispatch, watch_hotplug=False)
+
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            logging.error(f"Another daemon is already listening on {socket_path}")
+            manager.executor.shutdown(wait=False)
+            return 1
+        os.unlink(socket_path)  # stale socket from a previous run
+
+    server = None
+    try:
+        server = _bind(socket_path, manager)
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        logging.info(f"Listening on {socket_path} with {len(manager.devices)} devices.")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.server_close()
+            os.unlink(socket_path)
+        manager.executor.shutdown(wait=False)
+    return 0
+
+
+def _is_listening(socket_path):
+    """True if a live daemon accepts connections on socket_path."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def main(argv=None):
+    """Entry point for razer-control --daemon [SOCKET]."""
+    argv = sys.argv[1:] if argv is None else argv
+    logging.basicConfig(level=logging.INFO)
+    return serve(argv[0] if argv else None)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,33 +1,32 @@
 import sys
-import gi
+import time
 
-gi.require_version('Gtk', '4.0')
-gi.require_version('Adw', '1')
+_STARTED = time.perf_counter()
 
-from gi.repository import Adw
-from .ui.window import MainWindow
-from .core.razer_manager import RazerManager
-
-class RazerControlApp(Adw.Application):
-    """Main Application class for Razer Control."""
-    
-    def __init__(self):
-        super().__init__(application_id='de.dalu_wins.RazerControl')
-        self.razer_manager = None
-        self.window = None
-
-    def do_activate(self):
-        """Initializes manager and presents the main window."""
-        if not self.razer_manager:
-            self.razer_manager = RazerManager()
-        
-        # Ensure window is only created once
-        if not self.window:
-            self.window = MainWindow(self, self.razer_manager)
-            
-        self.window.present()
+USAGE = "usage: razer-control [--apply-profile NAME | --save-profile NAME | --daemon [SOCKET] | --profile-startup]"
 
 def main():
     """Entry point for the application."""
-    app = RazerControlApp()
-    return app.run(sys.argv)
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] in ('--apply-profile', '--save-profile'):
+        if len(sys.argv) != 3:
+            print(USAGE, file=sys.stderr)
+            return 2
+        # Headless path for login hooks, GTK/Adw are never imported
+        from .cli import main as cli_main
+        return cli_main([sys.argv[1].lstrip('-'), sys.argv[2]])
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--daemon':
+        from .daemon import main as daemon_main
+        return daemon_main(sys.argv[2:])
+
+    profiler = None
+    argv = sys.argv
+    if '--profile-startup' in argv:
+        # Phasen bis zum ersten Frame ausgeben und beenden
+        from .startup import StartupProfile
+        profiler = StartupProfile(_STARTED)
+        argv = [arg for arg in argv if arg != '--profile-startup']
+
+    from .app import RazerControlApp
+    app = RazerControlApp(profiler=profiler)
+    return app.run(argv)
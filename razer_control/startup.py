@@ -0,0 +1,28 @@
+"""Phase timing for `razer-control --profile-startup`."""
+import sys
+import time
+
+IMPORT_BUDGET_MS = 400  # gi, Adw, dbus and openrazer until the first window can be built
+
+
+class StartupProfile:
+    """Records the time spent in each startup phase since the previous mark."""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self._last = self.started
+        self.phases = []  # (name, seconds)
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self, file=None):
+        file = file or sys.stderr
+        for phase, seconds in self.phases:
+            note = ""
+            if phase == 'imports' and seconds * 1000 > IMPORT_BUDGET_MS:
+                note = f"  over budget ({IMPORT_BUDGET_MS} ms)"
+            print(f"{phase:<20} {seconds * 1000:8.1f} ms{note}", file=file)
+        print(f"{'total':<20} {(self._last - self.started) * 1000:8.1f} ms", file=file)
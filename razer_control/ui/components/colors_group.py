@@ -1,6 +1,8 @@
 from gi.repository import Adw, Gtk, Gdk
 
+from razer_control.core.instrumentation import instrumentation
 from razer_control.ui.components.color_picker import ColorPickerWindow
+from razer_control.ui.swatch_styles import swatch_styles
 
 class ColorGroup(Adw.PreferencesGroup):
     PRESET_COLORS = ["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF", "#FFFFFF"]
@@ -25,8 +27,8 @@ class ColorGroup(Adw.PreferencesGroup):
             rgba = Gdk.RGBA()
             rgba.parse(hex_color)
             btn = Gtk.Button(css_classes=["circular", "color-preset-btn"])
-            dot = Gtk.Box(width_request=20, height_request=20)
-            self._apply_preset_style(btn, dot, hex_color)
+            dot = Gtk.Box(width_request=20, height_request=20, css_classes=["swatch-dot"])
+            swatch_styles.set_color(dot, hex_color)
             btn.set_child(dot)
             btn.connect("clicked", self._on_preset_clicked, rgba)
             self.color_controls.append(btn)
@@ -41,7 +43,7 @@ class ColorGroup(Adw.PreferencesGroup):
         self.open_picker_btn = Gtk.Button(valign=Gtk.Align.CENTER, css_classes=["circular"])
         
         # Die farbige Vorschau im Button
-        self.color_preview_dot = Gtk.Box(width_request=24, height_request=24)
+        self.color_preview_dot = Gtk.Box(width_request=24, height_request=24, css_classes=["swatch-preview"])
         self.open_picker_btn.set_child(self.color_preview_dot)
         
         self.open_picker_btn.connect("clicked", self._on_open_picker)
@@ -49,32 +51,17 @@ class ColorGroup(Adw.PreferencesGroup):
         self.add(self.custom_color_row)
 
     def _update_button_preview(self, rgba):
-        """Aktualisiert die Farbe des rechteckigen Buttons."""
-        hex_color = "#{:02x}{:02x}{:02x}".format(
-            int(rgba.red * 255), 
-            int(rgba.green * 255), 
-            int(rgba.blue * 255)
-        )
-        provider = Gtk.CssProvider()
-        # border-radius auf 6px für ein modernes Rechteck-Design
-        css = f"""
-            box {{ 
-                background-color: {hex_color};
-                border-radius: 6px;
-            }}
-        """
-        provider.load_from_data(css.encode())
-        
-        self.color_preview_dot.get_style_context().add_provider(
-            provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
+        """Aktualisiert die Farbe des rechteckigen Buttons (tauscht nur die Swatch-Klasse)."""
+        swatch_styles.set_color(self.color_preview_dot, rgba)
 
     def _on_open_picker(self, _btn):
         if self.picker_window and self.picker_window.get_visible():
             self.picker_window.present()
             return
 
-        state = self.manager.get_current_state(self.serial)
+        self.manager.get_current_state_async(self.serial, callback=self._present_picker)
+
+    def _present_picker(self, state):
         rgba = Gdk.RGBA()
         if state:
             rgba.red, rgba.green, rgba.blue = state['r']/255, state['g']/255, state['b']/255
@@ -86,22 +73,25 @@ class ColorGroup(Adw.PreferencesGroup):
 
     def _on_color_changed_callback(self, rgba):
         """Wird vom Picker-Fenster (Apply) aufgerufen."""
-        # Hardware Update
-        r, g, b = [int(c * 255) for c in [rgba.red, rgba.green, rgba.blue]]
-        effect = self.get_effect_callback()
-        self.manager.set_effect(effect, r, g, b, device_serial=self.serial)
-        
-        # UI Update (Vorschau-Button)
-        self._update_button_preview(rgba)
+        with instrumentation.timed(self.serial, 'ui.color_changed'):
+            # Hardware Update
+            r, g, b = [int(c * 255) for c in [rgba.red, rgba.green, rgba.blue]]
+            effect = self.get_effect_callback()
+            self.manager.set_effect_async(effect, r, g, b, device_serial=self.serial)
+            
+            # UI Update (Vorschau-Button)
+            self._update_button_preview(rgba)
 
     def _on_preset_clicked(self, _btn, rgba):
         if self.picker_window:
-            self.chooser.update_rgba(rgba)
+            self.picker_window.update_rgba(rgba)
         self._on_color_changed_callback(rgba)
 
     def _load_initial_state(self):
         """Liest die Farbe beim Start aus und setzt die UI-Vorschau."""
-        state = self.manager.get_current_state(self.serial)
+        self.manager.get_current_state_async(self.serial, callback=self._apply_state)
+
+    def _apply_state(self, state):
         if state:
             rgba = Gdk.RGBA()
             # Umrechnung von 0-255 auf 0.0-1.0
@@ -116,12 +106,3 @@ class ColorGroup(Adw.PreferencesGroup):
             # Falls das Picker-Fenster (warum auch immer) schon existiert:
             if self.picker_window:
                 self.picker_window.update_rgba(rgba)
-
-    def _apply_preset_style(self, button, dot, hex_color):
-        btn_provider = Gtk.CssProvider()
-        btn_provider.load_from_data(b"button { padding: 4px; border-radius: 99px; min-width: 0; min-height: 0; }")
-        button.get_style_context().add_provider(btn_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-
-        dot_provider = Gtk.CssProvider()
-        dot_provider.load_from_data(f"box {{ background-color: {hex_color}; border-radius: 99px; }}".encode())
-        dot.get_style_context().add_provider(dot_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
@@ -1,5 +1,7 @@
 from gi.repository import Gtk, Adw
 
+from razer_control.core.instrumentation import instrumentation
+
 class DefaultGroup(Adw.PreferencesGroup):
     """Verwaltet Lighting Effects und Brightness: UI, Hardware-Sync und Signale."""
     
@@ -46,7 +48,9 @@ class DefaultGroup(Adw.PreferencesGroup):
         self.add(self.brightness_row)
 
     def _load_initial_state(self):
-        state = self.manager.get_current_state(self.serial)
+        self.manager.get_current_state_async(self.serial, callback=self._apply_state)
+
+    def _apply_state(self, state):
         if not state:
             return
 
@@ -57,6 +61,10 @@ class DefaultGroup(Adw.PreferencesGroup):
             self.dropdown.set_selected(idx)
             self.dropdown.handler_unblock_by_func(self._on_effect_changed)
 
+            # DevicePage hat die Sichtbarkeit schon mit Index 0 berechnet
+            if self.on_change_callback:
+                self.on_change_callback(state['effect'])
+
         # Brightness UI Sync
         if 'brightness' in state:
             self.brightness_scale.handler_block_by_func(self._on_brightness_changed)
@@ -72,26 +80,29 @@ class DefaultGroup(Adw.PreferencesGroup):
         idx = self.dropdown.get_selected()
         if idx == -1: return
         
-        effect = self.supported_effects[idx]
+        with instrumentation.timed(self.serial, 'ui.effect_changed'):
+            effect = self.supported_effects[idx]
+            self.manager.executor.submit(self.serial, self._apply_effect, effect)
 
-        state = self.manager.get_current_state(device_serial=self.serial)
+            if self.on_change_callback:
+                self.on_change_callback(effect)
 
+    def _apply_effect(self, effect):
+        """Läuft im Device-Worker, blockiert also nicht den UI-Thread."""
+        # Farbe aus dem State-Cache, kein zusätzlicher Hardware-Read
+        state = self.manager.get_current_state(device_serial=self.serial)
 
         if state and not (state['r'] == 0 and state['g'] == 0 and state['b'] == 0):
-            self.manager.set_effect(effect, device_serial=self.serial, r=state['r'], g=state['g'], b=state['b'])
+            r, g, b = state['r'], state['g'], state['b']
         else:
-            self.manager.set_effect(effect, device_serial=self.serial, r=0, g=255, b=0)
-        
-
-        self.manager.set_effect(effect, device_serial=self.serial, r=state['r'], g=state['g'], b=state['b'])
-        
-        if self.on_change_callback:
-            self.on_change_callback(effect)
+            r, g, b = 0, 255, 0
+        self.manager.set_effect(effect, r, g, b, device_serial=self.serial)
 
     def _on_brightness_changed(self, scale):
-        val = int(scale.get_value())
-        self.manager.set_brightness(val, device_serial=self.serial)
-        self.brightness_label.set_text(f"{val}%")
+        with instrumentation.timed(self.serial, 'ui.brightness_changed'):
+            val = int(scale.get_value())
+            self.manager.schedule_brightness(val, device_serial=self.serial)
+            self.brightness_label.set_text(f"{val}%")
 
     def get_current_effect(self):
         idx = self.dropdown.get_selected()
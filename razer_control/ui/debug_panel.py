@@ -0,0 +1,84 @@
+from gi.repository import Gtk, Adw, GLib
+
+from razer_control.core.instrumentation import instrumentation, default_dump_path
+
+class DebugPanel(Adw.Window):
+    """Live view of the instrumentation: latency and error counts per device and method."""
+
+    REFRESH_SECONDS = 1
+
+    def __init__(self, parent, razer_manager):
+        super().__init__(title="Instrumentation", transient_for=parent)
+        self.manager = razer_manager
+        self.set_default_size(640, 560)
+
+        toolbar = Adw.ToolbarView()
+        header = Adw.HeaderBar()
+
+        dump_btn = Gtk.Button(label="Save JSON")
+        dump_btn.connect("clicked", self._on_dump_clicked)
+        header.pack_start(dump_btn)
+
+        reset_btn = Gtk.Button(icon_name="edit-clear-symbolic", tooltip_text="Reset counters")
+        reset_btn.connect("clicked", self._on_reset_clicked)
+        header.pack_end(reset_btn)
+        toolbar.add_top_bar(header)
+
+        self.toast_overlay = Adw.ToastOverlay()
+        self.scrolled = Gtk.ScrolledWindow(vexpand=True)
+        self.toast_overlay.set_child(self.scrolled)
+        toolbar.set_content(self.toast_overlay)
+        self.set_content(toolbar)
+
+        self._refresh()
+        self._timer = GLib.timeout_add_seconds(self.REFRESH_SECONDS, self._refresh)
+        self.connect("close-request", self._on_close)
+
+    def _refresh(self):
+        """Rebuild the page from a fresh snapshot. Keeps the scroll position."""
+        page = Adw.PreferencesPage()
+        devices = instrumentation.snapshot()['devices']
+        names = {dev.serial: dev.name for dev in self.manager.devices}
+
+        if not devices:
+            page.add(Adw.PreferencesGroup(description="No calls recorded yet."))
+
+        for device, entry in devices.items():
+            group = Adw.PreferencesGroup(title=names.get(device, device), description=device)
+            # Langsamste Aufrufe zuerst
+            for method, stats in sorted(entry['methods'].items(), key=lambda item: -item[1]['p95_ms']):
+                row = Adw.ActionRow(
+                    title=method,
+                    subtitle=f"{stats['calls']} calls · avg {stats['avg_ms']:.2f} ms · "
+                             f"p95 {stats['p95_ms']:.2f} ms · max {stats['max_ms']:.2f} ms"
+                )
+                if stats['errors']:
+                    errors = Gtk.Label(label=f"{stats['errors']} errors", css_classes=["error"])
+                    row.add_suffix(errors)
+                group.add(row)
+            for name, value in entry['counters'].items():
+                group.add(Adw.ActionRow(title=name, subtitle=str(value)))
+            page.add(group)
+
+        adjustment = self.scrolled.get_vadjustment()
+        position = adjustment.get_value()
+        self.scrolled.set_child(page)
+        GLib.idle_add(adjustment.set_value, position)
+        return GLib.SOURCE_CONTINUE
+
+    def _on_dump_clicked(self, _btn):
+        try:
+            path = instrumentation.dump(default_dump_path())
+            self.toast_overlay.add_toast(Adw.Toast(title=f"Saved to {path}"))
+        except OSError as e:
+            self.toast_overlay.add_toast(Adw.Toast(title=f"Could not save: {e}"))
+
+    def _on_reset_clicked(self, _btn):
+        instrumentation.reset()
+        self._refresh()
+
+    def _on_close(self, *args):
+        if self._timer:
+            GLib.source_remove(self._timer)
+            self._timer = None
+        return False
@@ -4,10 +4,10 @@ from razer_control.ui.components.colors_group import ColorGroup
 from razer_control.ui.components.general_group import DefaultGroup
 
 class DevicePage(Adw.Bin):
-    def __init__(self, device_data, razer_manager):
+    def __init__(self, device, razer_manager):
         super().__init__()
         self.manager = razer_manager
-        self.serial = device_data['fx']._serial
+        self.serial = device.serial
         self.supported_effects = self.manager.get_all_supported_effects(self.serial)
 
         self._build_ui()
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+from gi.repository import Gtk, Gdk
+
+BASE_CSS = """
+button.color-preset-btn { padding: 4px; border-radius: 99px; min-width: 0; min-height: 0; }
+.swatch-dot { border-radius: 99px; }
+.swatch-preview { border-radius: 6px; }
+"""
+
+class SwatchStyles:
+    """One display-wide stylesheet for color swatches instead of a CssProvider per widget.
+
+    Every color gets a generated class (.swatch-c-ff0000). Classes live in an LRU cache;
+    only classes no widget uses anymore are evicted, and the stylesheet is reloaded only
+    when a new color comes in, so picking a known color again costs nothing.
+    """
+
+    CLASS_PREFIX = "swatch-c-"
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self._classes = OrderedDict()  # hex -> number of widgets using it, least recently used first
+        self._widgets = {}             # id(widget) -> hex
+        self._provider = None
+        self.reloads = 0
+
+    def _ensure_provider(self):
+        if self._provider is None:
+            self._provider = Gtk.CssProvider()
+            Gtk.StyleContext.add_provider_for_display(
+                Gdk.Display.get_default(), self._provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+            )
+            self._reload()
+
+    def _reload(self):
+        rules = [BASE_CSS]
+        rules += [f".{self.CLASS_PREFIX}{hex_color} {{ background-color: #{hex_color}; }}" for hex_color in self._classes]
+        self._provider.load_from_data("\n".join(rules).encode())
+        self.reloads += 1
+
+    @staticmethod
+    def normalize(color):
+        """'#FF0000', 'ff0000' or a Gdk.RGBA -> 'ff0000'."""
+        if isinstance(color, Gdk.RGBA):
+            return "{:02x}{:02x}{:02x}".format(int(color.red * 255), int(color.green * 255), int(color.blue * 255))
+        return color.lstrip('#').lower()
+
+    def set_color(self, widget, color):
+        """Give widget the swatch class of color, replacing its previous one."""
+        self._ensure_provider()
+        hex_color = self.normalize(color)
+        key = id(widget)
+        previous = self._widgets.get(key)
+        if previous == hex_color:
+            self._classes.move_to_end(hex_color)
+            return
+
+        if previous is None:
+            widget.connect("destroy", self._on_widget_destroyed, key)
+        else:
+            widget.remove_css_class(self.CLASS_PREFIX + previous)
+            self._classes[previous] -= 1
+
+        added = hex_color not in self._classes
+        self._classes[hex_color] = self._classes.get(hex_color, 0) + 1
+        self._classes.move_to_end(hex_color)
+        self._widgets[key] = hex_color
+        if added:
+            self._evict()
+            self._reload()
+        widget.add_css_class(self.CLASS_PREFIX + hex_color)
+
+    def _evict(self):
+        """Drop least recently used classes beyond capacity, skipping those still in use."""
+        excess = len(self._classes) - self.capacity
+        for hex_color in [c for c, users in self._classes.items() if users == 0][:max(0, excess)]:
+            del self._classes[hex_color]
+
+    def _on_widget_destroyed(self, widget, key):
+        hex_color = self._widgets.pop(key, None)
+        if hex_color in self._classes:
+            self._classes[hex_color] -= 1
+
+
+swatch_styles = SwatchStyles()
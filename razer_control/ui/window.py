@@ -1,11 +1,16 @@
-from gi.repository import Gtk, Adw
+from gi.repository import Gtk, Adw, GLib
+from razer_control.core.instrumentation import instrumentation
 from razer_control.ui.placeholder_page import PlaceholderPage
+from razer_control.ui.debug_panel import DebugPanel
 from .device_page import DevicePage
 
 class MainWindow(Adw.Window):
-    def __init__(self, app, razer_manager):
+    def __init__(self, app, razer_manager, prefetch_pages=True):
         super().__init__(application=app, title="Razer Control")
         self.razer_manager = razer_manager
+        self.prefetch_pages = prefetch_pages # Restliche Seiten im Leerlauf bauen, nach dem ersten Frame
+        self.debug_panel = None
+        self._prefetch_source = None
         self.set_default_size(1000, 600)
 
         # 1. Root Layout
@@ -14,7 +19,11 @@ class MainWindow(Adw.Window):
 
         # 2. Sidebar Setup
         sidebar_toolbar = Adw.ToolbarView()
-        sidebar_toolbar.add_top_bar(Adw.HeaderBar())
+        sidebar_header = Adw.HeaderBar()
+        debug_btn = Gtk.Button(icon_name="utilities-system-monitor-symbolic", tooltip_text="Instrumentation")
+        debug_btn.connect("clicked", self._on_debug_clicked)
+        sidebar_header.pack_end(debug_btn)
+        sidebar_toolbar.add_top_bar(sidebar_header)
 
         self.device_list = Gtk.ListBox()
         self.device_list.add_css_class("navigation-sidebar")
@@ -56,28 +65,103 @@ class MainWindow(Adw.Window):
 
     def _load_devices(self):
         """Populate UI or show placeholders."""
+        self._rows = {}         # serial -> sidebar row
+        self._row_serials = {}  # sidebar row -> serial
+        self._pages = {}        # serial -> DevicePage, erst bei Auswahl oder Prefetch gebaut
+        self.razer_manager.connect_devices_changed(self._on_devices_changed)
+
         if not self.razer_manager.devices:
-            # Main content placeholder
-            self.content_stack.add_named(PlaceholderPage(), "empty")
-            self.content_stack.set_visible_child_name("empty")
-            self.content_header.set_title_widget(Gtk.Label(label="Disconnected"))
+            self._show_placeholder()
             return
 
         # Regular device loading
-        for i, dev in enumerate(self.razer_manager.devices):
-            row = Adw.ActionRow(title=dev['name'])
-            self.device_list.append(row)
-
-            page = DevicePage(dev, self.razer_manager)
-            self.content_stack.add_titled(page, str(i), dev['name'])
+        for dev in self.razer_manager.devices:
+            self._add_device(dev)
 
         if first := self.device_list.get_row_at_index(0):
             self.device_list.select_row(first)
+        self._schedule_prefetch()
+
+    def _show_placeholder(self):
+        # Main content placeholder
+        if not self.content_stack.get_child_by_name("empty"):
+            self.content_stack.add_named(PlaceholderPage(), "empty")
+        self.content_stack.set_visible_child_name("empty")
+        self.content_header.set_title_widget(Gtk.Label(label="Disconnected"))
+
+    def _add_device(self, dev):
+        """Append one sidebar row. Its DevicePage is built on first selection (see _ensure_page)."""
+        serial = dev.serial
+        row = Adw.ActionRow(title=dev.name)
+        self.device_list.append(row)
+        self._rows[serial] = row
+        self._row_serials[row] = serial
+
+    def _ensure_page(self, serial):
+        """Build the DevicePage of a device if that has not happened yet."""
+        page = self._pages.get(serial)
+        if page is None:
+            dev = self.razer_manager.devices.get(serial)
+            with instrumentation.timed(serial, 'ui.page_construct'):
+                page = DevicePage(dev, self.razer_manager)
+            self._pages[serial] = page
+            self.content_stack.add_titled(page, serial, dev.name)
+        return page
+
+    def _schedule_prefetch(self):
+        if self.prefetch_pages and self._prefetch_source is None:
+            self._prefetch_source = GLib.idle_add(self._prefetch_next_page, priority=GLib.PRIORITY_LOW)
+
+    def _prefetch_next_page(self):
+        """Idle callback: build one missing page per call, so input and drawing stay responsive."""
+        missing = next((serial for serial in self._rows if serial not in self._pages), None)
+        if missing is None:
+            self._prefetch_source = None
+            return GLib.SOURCE_REMOVE
+        self._ensure_page(missing)
+        return GLib.SOURCE_CONTINUE
+
+    def _remove_device(self, serial):
+        """Drop the sidebar row and DevicePage of an unplugged device."""
+        row = self._rows.pop(serial, None)
+        if row is None:
+            return
+        self._row_serials.pop(row, None)
+        self.device_list.remove(row)
+
+        if page := self._pages.pop(serial, None):
+            self.content_stack.remove(page)
+
+    def _on_devices_changed(self, added, removed):
+        """Hotplug: only touch the rows and pages of the affected devices."""
+        for dev in removed:
+            self._remove_device(dev.serial)
+        for dev in added:
+            self._add_device(dev)
+
+        if not self._rows:
+            self._show_placeholder()
+            return
+
+        if placeholder := self.content_stack.get_child_by_name("empty"):
+            self.content_stack.remove(placeholder)
+
+        if self.device_list.get_selected_row() is None:
+            self.device_list.select_row(self.device_list.get_row_at_index(0))
+        self._schedule_prefetch()
+
+    def _on_debug_clicked(self, _btn):
+        """Open the instrumentation panel, or bring it to the front."""
+        if not self.debug_panel or not self.debug_panel.get_visible():
+            self.debug_panel = DebugPanel(self, self.razer_manager)
+        self.debug_panel.present()
 
     def _on_device_selected(self, listbox, row):
         if row:
-            idx = str(row.get_index())
-            self.content_stack.set_visible_child_name(idx)
-            
-            title = self.razer_manager.devices[row.get_index()]['name']
-            self.content_header.set_title_widget(Gtk.Label(label=title, css_classes=["title"]))
\ No newline at end of file
+            serial = self._row_serials[row]
+            with instrumentation.timed(serial, 'ui.device_selected'):
+                self._ensure_page(serial)
+                self.content_stack.set_visible_child_name(serial)
+                
+                title = self.razer_manager.devices.get(serial).name
+                self.content_header.set_title_widget(Gtk.Label(label=title, css_classes=["title"]))
\ No newline at end of file
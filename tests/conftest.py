@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from tests.mock_daemon import MockDaemon, install_stand_ins
+
+install_stand_ins()  # before anything imports razer_control.core
+
+from razer_control.core.instrumentation import instrumentation  # noqa: E402
+from razer_control.core.profiles import ProfileStore  # noqa: E402
+
+
+@pytest.fixture
+def daemon():
+    return MockDaemon(devices=2)
+
+
+@pytest.fixture
+def make_manager(daemon, tmp_path):
+    """Build RazerManagers on the mock daemon; profiles go to tmp_path, executors are shut down afterwards."""
+    managers = []
+    instrumentation.reset()
+
+    def _make(**kwargs):
+        kwargs.setdefault('watch_hotplug', False)
+        kwargs.setdefault('profiles', ProfileStore(str(tmp_path / 'profiles.json')))
+        manager = daemon.manager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield _make
+    for manager in managers:
+        manager.executor.shutdown(wait=True)
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll condition() until it is true; for results that arrive on worker threads."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
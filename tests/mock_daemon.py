@@ -0,0 +1,406 @@
+"""
+In-process stand-in for the openrazer daemon, for benchmarks and tests without hardware.
+
+It fakes the pieces razer_control.core talks to: the session bus (get_object and
+signal receivers), the razer.device.lighting.* / razer.device.misc / razer.devices
+interfaces, openrazer.client.DeviceManager and opening single devices by serial.
+Device count, capabilities, matrix size and per-call latency are configurable.
+
+    install_stand_ins()  # only needed without dbus-python / openrazer
+    daemon = MockDaemon(devices=4, latency=0.002)
+    manager = daemon.manager()
+    manager.set_effect('static', 255, 0, 0)
+    daemon.calls[('MOCK0000', 'setStatic')]  # -> 1
+
+This is test and benchmark scaffolding, it is not part of the razer_control package.
+Importing it changes nothing; install_stand_ins() registers minimal dbus / openrazer
+modules if the real ones are missing and has to run before razer_control.core is imported.
+"""
+import sys
+import threading
+import time
+import types
+from collections import Counter
+
+DEFAULT_CAPABILITIES = {
+    'lighting': True,
+    'brightness': True,
+    'lighting_none': True,
+    'lighting_static': True,
+    'lighting_spectrum': True,
+    'lighting_wave': True,
+    'lighting_reactive': True,
+    'lighting_breath_single': True,
+    'lighting_breath_random': True,
+    'lighting_led_matrix': True,
+    'lighting_led_single': True,
+    'lighting_logo': True,
+    'lighting_logo_static': True,
+}
+
+# What openrazer.client.devices.RazerDevice() asks the daemon while DeviceManager() builds the list
+SCAN_METHODS = ('getDeviceType', 'getDeviceName', 'getFirmware', 'getDriverVersion', 'getVidPid', 'getMatrixDimensions')
+
+
+def install_stand_ins():
+    """Register minimal dbus / openrazer modules when the real ones are missing. Opt-in, for harnesses only."""
+    try:
+        import dbus  # noqa: F401
+    except ImportError:
+        dbus = types.ModuleType('dbus')
+        proxies = types.ModuleType('dbus.proxies')
+
+        class ProxyObject:
+            pass
+
+        class Interface:
+            def __init__(self, obj, dbus_interface):
+                self.proxy_object = obj
+                self.dbus_interface = dbus_interface
+
+            def __getattr__(self, member):
+                if member.startswith('__'):
+                    raise AttributeError(member)
+                return self.proxy_object.get_dbus_method(member, self.dbus_interface)
+
+        def SessionBus():
+            raise RuntimeError("dbus-python is not installed; use MockDaemon")
+
+        proxies.ProxyObject = ProxyObject
+        dbus.proxies = proxies
+        dbus.Interface = Interface
+        dbus.SessionBus = SessionBus
+        sys.modules['dbus'] = dbus
+        sys.modules['dbus.proxies'] = proxies
+
+    try:
+        import openrazer.client  # noqa: F401
+    except ImportError:
+        openrazer = types.ModuleType('openrazer')
+        client = types.ModuleType('openrazer.client')
+        constants = types.ModuleType('openrazer.client.constants')
+        # Values as defined by openrazer.client.constants
+        constants.WAVE_RIGHT, constants.WAVE_LEFT = 0x01, 0x02
+        constants.WHEEL_RIGHT, constants.WHEEL_LEFT = 0x01, 0x02
+        constants.REACTIVE_500MS, constants.REACTIVE_1000MS = 0x01, 0x02
+        constants.REACTIVE_1500MS, constants.REACTIVE_2000MS = 0x03, 0x04
+        constants.STARLIGHT_FAST, constants.STARLIGHT_NORMAL, constants.STARLIGHT_SLOW = 0x01, 0x02, 0x03
+        constants.RIPPLE_REFRESH_RATE = 0.05
+
+        def DeviceManager():
+            raise RuntimeError("openrazer is not installed; use MockDaemon")
+
+        client.constants = constants
+        client.DeviceManager = DeviceManager
+        openrazer.client = client
+        sys.modules['openrazer'] = openrazer
+        sys.modules['openrazer.client'] = client
+        sys.modules['openrazer.client.constants'] = constants
+
+
+class MockDevice:
+    """Hardware state of one fake device, mutated by the fake D-Bus methods."""
+
+    def __init__(self, serial, name, capabilities, matrix_dims):
+        self.serial = serial
+        self.name = name
+        self.capabilities = dict(capabilities)
+        self.matrix_dims = matrix_dims
+
+        self.effect = 'static'
+        self.colors = [0, 255, 0, 0, 0, 0, 0, 0, 0]
+        self.speed = 1
+        self.wave_dir = 1
+        self.brightness = 100.0
+        self.custom_rows = {}  # row id -> last uploaded row payload
+        self.zones = {}        # zone name -> {'effect': ..., 'active': ...}
+        self.latency = None    # per-call latency of this device, overrides the daemon's
+
+
+class MockProxy:
+    """Fake dbus ProxyObject for /org/razer/device/SERIAL."""
+
+    def __init__(self, daemon, device):
+        self.daemon = daemon
+        self.device = device
+        self.object_path = f"/org/razer/device/{device.serial}"
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        impl = getattr(self, '_' + member, None)
+        if impl is None:
+            impl = self._zone_method(member)
+        return self.daemon._wrap(self.device.serial, member, impl)
+
+    # razer.device.lighting.chroma
+    def _getEffect(self):
+        return self.device.effect
+
+    def _getEffectColors(self):
+        return list(self.device.colors)
+
+    def _getEffectSpeed(self):
+        return self.device.speed
+
+    def _getWaveDir(self):
+        return self.device.wave_dir
+
+    def _set(self, effect, *rgb):
+        self.device.effect = effect
+        if rgb:
+            self.device.colors = (list(rgb) + [0] * 9)[:9]
+
+    def _setNone(self):
+        self._set('none')
+
+    def _setSpectrum(self):
+        self._set('spectrum')
+
+    def _setWave(self, direction):
+        self._set('wave')
+        self.device.wave_dir = direction
+
+    def _setWheel(self, direction):
+        self._set('wheel')
+
+    def _setStatic(self, r, g, b):
+        self._set('static', r, g, b)
+
+    def _setReactive(self, r, g, b, time_):
+        self._set('reactive', r, g, b)
+
+    def _setBreathSingle(self, r, g, b):
+        self._set('breathSingle', r, g, b)
+
+    def _setBreathDual(self, *rgb):
+        self._set('breathDual', *rgb)
+
+    def _setBreathTriple(self, *rgb):
+        self._set('breathTriple', *rgb)
+
+    def _setBreathRandom(self):
+        self._set('breathRandom')
+
+    def _setStarlightSingle(self, r, g, b, time_):
+        self._set('starlightSingle', r, g, b)
+
+    def _setStarlightDual(self, r, g, b, r2, g2, b2, time_):
+        self._set('starlightDual', r, g, b, r2, g2, b2)
+
+    def _setStarlightRandom(self, time_):
+        self._set('starlightRandom')
+
+    def _setKeyRow(self, payload):
+        payload = bytes(payload)
+        line = 3 + self.device.matrix_dims[1] * 3
+        for offset in range(0, len(payload), line):
+            self.device.custom_rows[payload[offset]] = payload[offset:offset + line]
+
+    def _setCustom(self):
+        self._set('custom')
+
+    def _setKey(self, row, col, rgb):
+        self._set('custom')
+
+    def _restoreLastEffect(self):
+        self._set('static')
+
+    # razer.device.lighting.custom
+    def _setRipple(self, r, g, b, refresh_rate):
+        self._set('ripple', r, g, b)
+
+    def _setRippleRandomColour(self, refresh_rate):
+        self._set('rippleRandomColour')
+
+    # razer.device.lighting.brightness
+    def _getBrightness(self):
+        return self.device.brightness
+
+    def _setBrightness(self, value):
+        self.device.brightness = float(value)
+
+    # razer.device.misc
+    def _getDeviceName(self):
+        return self.device.name
+
+    def _getMatrixDimensions(self):
+        return list(self.device.matrix_dims)
+
+    def _zone_method(self, member):
+        """Generic get/set for razer.device.lighting.<zone> methods like setLogoStatic or getScrollActive."""
+        def _call(*args):
+            zone = self.device.zones.setdefault(member[3:], {})
+            if member.startswith('set'):
+                zone['value'] = args
+                return None
+            return zone.get('value', (0,))[0]
+        return _call
+
+
+class MockDaemonObject:
+    """Fake /org/razer object serving razer.devices."""
+
+    object_path = '/org/razer'
+
+    def __init__(self, daemon):
+        self.daemon = daemon
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        if member == 'getDevices':
+            return self.daemon._wrap('daemon', member, lambda: [dev.serial for dev in self.daemon.devices])
+        raise AttributeError(member)
+
+
+class MockBus:
+    """Fake session bus: object lookup and signal subscriptions."""
+
+    def __init__(self, daemon):
+        self.daemon = daemon
+        self.receivers = []
+        self.get_object_calls = 0
+
+    def get_object(self, bus_name, object_path):
+        self.get_object_calls += 1
+        if object_path == '/org/razer':
+            return MockDaemonObject(self.daemon)
+        serial = object_path.rsplit('/', 1)[-1]
+        device = self.daemon.device(serial)
+        if device is None:
+            raise LookupError(f"No such device: {serial}")
+        return MockProxy(self.daemon, device)
+
+    def add_signal_receiver(self, handler, signal_name=None, **kwargs):
+        self.receivers.append((signal_name, handler))
+
+    def emit(self, signal_name):
+        for name, handler in self.receivers:
+            if name == signal_name:
+                handler()
+
+
+class MockRawDevice:
+    """What openrazer.client's DeviceManager hands out, as far as RazerManager uses it."""
+
+    def __init__(self, daemon, device):
+        self._daemon = daemon
+        self._device = device
+        self.serial = device.serial
+        self.name = device.name
+        self.capabilities = device.capabilities
+        rows, cols = device.matrix_dims
+        self.fx = types.SimpleNamespace(advanced=types.SimpleNamespace(rows=rows, cols=cols) if rows > 0 else None)
+
+    def has(self, capability):
+        return self.capabilities.get(capability, False)
+
+    @property
+    def brightness(self):
+        return self._daemon._wrap(self.serial, 'getBrightness', lambda: self._device.brightness)()
+
+    @brightness.setter
+    def brightness(self, value):
+        self._daemon._wrap(self.serial, 'setBrightness', lambda: setattr(self._device, 'brightness', float(value)))()
+
+
+class MockDaemon:
+    """A configurable set of fake devices plus the bus and DeviceManager to reach them."""
+
+    def __init__(self, devices=1, capabilities=None, matrix_dims=(6, 22), latency=0.0, method_latency=None):
+        self.latency = latency
+        self.method_latency = dict(method_latency or {})  # member -> seconds, overrides latency
+        self.calls = Counter()  # (serial, member) -> count
+        self.failing = set()  # members or (serial, member) pairs that raise, to test error paths
+        self._lock = threading.Lock()
+
+        self.devices = []
+        self.bus = MockBus(self)
+        for _ in range(devices):
+            self.add_device(capabilities=capabilities, matrix_dims=matrix_dims, notify=False)
+
+    def device(self, serial):
+        return next((dev for dev in self.devices if dev.serial == serial), None)
+
+    def add_device(self, serial=None, name=None, capabilities=None, matrix_dims=(6, 22), notify=True):
+        """Plug in a device; with notify the daemon's device_added signal is emitted."""
+        serial = serial or f"MOCK{len(self.devices):04d}"
+        device = MockDevice(serial, name or f"Mock Device {serial}", capabilities or DEFAULT_CAPABILITIES, matrix_dims)
+        self.devices.append(device)
+        if notify:
+            self.bus.emit('device_added')
+        return device
+
+    def remove_device(self, serial, notify=True):
+        """Unplug a device; with notify the daemon's device_removed signal is emitted."""
+        self.devices = [dev for dev in self.devices if dev.serial != serial]
+        if notify:
+            self.bus.emit('device_removed')
+
+    def device_manager(self):
+        """Stand-in for openrazer.client.DeviceManager(), including the D-Bus calls it makes per device."""
+        serials = self.bus.get_object('org.razer', '/org/razer').get_dbus_method('getDevices')()
+        manager = types.SimpleNamespace(sync_effects=True)
+        manager.devices = [self.open_device(serial) for serial in serials]
+        return manager
+
+    def open_device(self, serial):
+        """Stand-in for opening one device with openrazer.client's RazerDeviceFactory."""
+        device = self.device(serial)
+        if device is None:
+            raise LookupError(f"No such device: {serial}")
+        for member in SCAN_METHODS:
+            self._wrap(serial, member, lambda: None)()
+        return MockRawDevice(self, device)
+
+    def install(self):
+        """Point the shared D-Bus pool at this daemon's bus."""
+        from razer_control.core.dbus_pool import dbus_pool
+        dbus_pool.reset(lambda: self.bus)
+
+    def manager(self, **kwargs):
+        """Build a RazerManager wired to this daemon. Defaults to headless dispatch."""
+        from razer_control.core.device_executor import direct_dispatch
+        from razer_control.core.razer_manager import RazerManager
+
+        self.install()
+        kwargs.setdefault('dispatch', direct_dispatch)
+        return RazerManager(device_manager_factory=self.device_manager, device_factory=self.open_device, **kwargs)
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+    def _wrap(self, serial, member, impl):
+        """Add call counting, injected latency and reply_handler/error_handler support to a fake method."""
+        def _fail(*args):
+            raise RuntimeError(f"{member} failed")
+
+        def _call(*args, reply_handler=None, error_handler=None, **kwargs):
+            with self._lock:
+                self.calls[(serial, member)] += 1
+            latency = self.method_latency.get(member)
+            if latency is None:
+                device = self.device(serial)
+                latency = device.latency if device and device.latency is not None else self.latency
+
+            fn = _fail if member in self.failing or (serial, member) in self.failing else impl
+
+            if reply_handler is None:
+                if latency:
+                    time.sleep(latency)
+                return fn(*args)
+
+            def _reply():
+                try:
+                    result = fn(*args)
+                except Exception as e:
+                    if error_handler:
+                        error_handler(e)
+                    return
+                reply_handler(result)
+
+            if latency:
+                timer = threading.Timer(latency, _reply)
+                timer.daemon = True
+                timer.start()
+            else:
+                _reply()
+        return _call
@@ -0,0 +1,63 @@
+import threading
+
+from tests.conftest import wait_for
+
+
+def test_restart_restores_before_the_new_engine_draws(daemon, make_manager):
+    daemon.method_latency['restoreLastEffect'] = 0.05
+    manager = make_manager()
+    restores_at_first_frame = []
+
+    def render(frame, t):
+        if not restores_at_first_frame:
+            restores_at_first_frame.append(daemon.calls[('MOCK0000', 'restoreLastEffect')])
+
+    manager.start_animation('MOCK0000', lambda frame, t: None, fps=100)
+    engine = manager.start_animation('MOCK0000', render, fps=100)
+    try:
+        assert wait_for(lambda: engine.frames > 2)
+        assert restores_at_first_frame == [1]
+        assert daemon.device('MOCK0000').effect == 'custom'
+    finally:
+        manager.stop_animation('MOCK0000').result()
+
+    assert daemon.device('MOCK0000').effect == 'static'
+
+
+def test_stop_without_animation(make_manager):
+    assert make_manager().stop_animation('MOCK0000') is None
+
+
+def _changing(frame, t):
+    frame.set(0, 0, (int(t * 1000) % 256, 0, 0))  # a new pixel every frame, so every draw uploads
+
+
+def test_slow_uploads_drop_frames_instead_of_queueing(daemon, make_manager):
+    daemon.method_latency['setKeyRow'] = 0.05
+    manager = make_manager()
+
+    engine = manager.start_animation('MOCK0000', _changing, fps=100)
+    try:
+        assert wait_for(lambda: engine.frames >= 4)
+    finally:
+        manager.stop_animation('MOCK0000').result()
+
+    stats = engine.stats()
+    assert stats['dropped'] >= stats['frames']  # ~4 ticks missed per 50 ms upload
+    assert stats['fps'] < 25
+
+
+def test_stop_during_a_slow_draw_restores_after_the_last_frame(daemon, make_manager):
+    manager = make_manager()
+    engine = manager.start_animation('MOCK0000', _changing, fps=100)
+    assert wait_for(lambda: engine.frames >= 1)
+    daemon.method_latency['setKeyRow'] = 1.3  # longer than stop()'s join timeout
+    assert wait_for(lambda: daemon.calls[('MOCK0000', 'setKeyRow')] >= engine.frames + 1)
+
+    restored = manager.stop_animation('MOCK0000')
+    restored.result(timeout=3)
+    uploads = daemon.calls[('MOCK0000', 'setKeyRow')]
+
+    assert wait_for(lambda: 'razer-animation' not in {thread.name for thread in threading.enumerate()})
+    assert daemon.device('MOCK0000').effect == 'static'
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == uploads
@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+
+from razer_control.core.atomic_file import write_json_atomic
+from razer_control.core.instrumentation import Instrumentation
+
+
+def test_write_replaces_the_file(tmp_path):
+    path = tmp_path / 'sub' / 'data.json'
+    write_json_atomic(str(path), {'a': 1})
+    write_json_atomic(str(path), {'a': 2})
+
+    assert json.loads(path.read_text()) == {'a': 2}
+    assert os.listdir(path.parent) == ['data.json']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / 'data.json'
+    write_json_atomic(str(path), {'a': 1})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(str(path), {'a': object()})
+
+    assert json.loads(path.read_text()) == {'a': 1}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_instrumentation_dump(tmp_path):
+    stats = Instrumentation()
+    stats.count('MOCK0000', 'writes.applied.effect')
+    path = stats.dump(str(tmp_path / 'stats.json'))
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['devices']['MOCK0000']['counters'] == {'writes.applied.effect': 1}
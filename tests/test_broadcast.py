@@ -0,0 +1,51 @@
+import time
+
+from razer_control.core.instrumentation import instrumentation
+
+
+def test_broadcast_reports_every_device(daemon, make_manager):
+    manager = make_manager()
+
+    assert manager.set_brightness(30) == {'MOCK0000': 'ok', 'MOCK0001': 'ok'}
+    assert [daemon.device(serial).brightness for serial in ('MOCK0000', 'MOCK0001')] == [30.0, 30.0]
+
+
+def test_broadcast_runs_devices_in_parallel(daemon, make_manager):
+    manager = make_manager()
+    daemon.latency = 0.1
+
+    start = time.monotonic()
+    manager.set_brightness(30)
+
+    assert time.monotonic() - start < 0.18
+
+
+def test_hung_device_times_out_without_delaying_the_others(daemon, make_manager):
+    manager = make_manager()
+    daemon.device('MOCK0001').latency = 0.3
+
+    start = time.monotonic()
+    report = manager.broadcast(manager._set_brightness_on, 30, timeout=0.1)
+    elapsed = time.monotonic() - start
+
+    assert report == {'MOCK0000': 'ok', 'MOCK0001': 'timeout'}
+    assert elapsed < 0.5
+    assert daemon.device('MOCK0000').brightness == 30.0
+    assert instrumentation.snapshot()['devices']['MOCK0001']['counters']['broadcast.timeout'] == 1
+
+
+def test_failing_device_is_reported_as_error(daemon, make_manager):
+    manager = make_manager()
+    daemon.failing.add('setStatic')
+
+    report = manager.set_effect('static', 255, 0, 0)
+
+    assert report == {'MOCK0000': 'error: setStatic failed', 'MOCK0001': 'error: setStatic failed'}
+
+
+def test_apply_profile_timeout(daemon, make_manager):
+    manager = make_manager()
+    manager.save_profile('p')
+    daemon.device('MOCK0000').latency = 0.3
+
+    assert manager.apply_profile('p', timeout=0.1) == {'MOCK0000': 'timeout', 'MOCK0001': 'ok'}
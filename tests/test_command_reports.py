@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from razer_control.cli import _build_parser, _run
+from razer_control.daemon import ControlDaemon
+from tests.mock_daemon import MockDaemon
+
+CAPABILITIES = {'lighting': True, 'brightness': True, 'lighting_static': True}  # no spectrum
+
+
+def _cli(manager, *argv):
+    return _run(_build_parser().parse_args(list(argv)), manager)
+
+
+def _request(manager, **request):
+    responses = []
+    ControlDaemon(manager).dispatch(dict(request, id=1), lambda _id, **kwargs: responses.append(kwargs))
+    manager.executor.drain(1.0)
+    return responses[0]
+
+
+def test_single_device_calls_return_a_report(daemon, make_manager):
+    manager = make_manager()
+    daemon.failing.add('setBrightness')
+
+    assert manager.set_effect('static', 1, 2, 3, device_serial='MOCK0000') == {'MOCK0000': 'ok'}
+    assert manager.set_brightness(10, device_serial='MOCK0000') == {'MOCK0000': 'error: setBrightness failed'}
+
+
+def test_cli_exit_codes(daemon, make_manager, capsys):
+    manager = make_manager()
+
+    assert _cli(manager, 'set-effect', 'static', '--device', 'MOCK0000') == 0
+    daemon.failing.add('setStatic')
+    assert _cli(manager, 'set-effect', 'static', '--color', '0000FF', '--device', 'MOCK0000') == 1
+    daemon.failing.add('setBrightness')
+    assert _cli(manager, 'set-brightness', '20', '--device', 'MOCK0000') == 1
+    assert 'MOCK0000: error: setBrightness failed' in capsys.readouterr().out
+
+
+def test_cli_unsupported_effect_fails(capsys):
+    daemon = MockDaemon(devices=1, capabilities=CAPABILITIES)
+    manager = daemon.manager(watch_hotplug=False)
+    try:
+        assert _cli(manager, 'set-effect', 'spectrum', '--device', 'MOCK0000') == 1
+        assert 'MOCK0000: unsupported' in capsys.readouterr().out
+    finally:
+        manager.executor.shutdown(wait=True)
+
+
+def test_daemon_reports_failures(daemon, make_manager):
+    manager = make_manager()
+
+    assert _request(manager, cmd='set-brightness', value=30, device='MOCK0000') == {'result': {'MOCK0000': 'ok'}}
+    daemon.failing.add('setBrightness')
+    assert 'error' in _request(manager, cmd='set-brightness', value=40, device='MOCK0000')
+    broadcast = _request(manager, cmd='set-brightness', value=50)
+    assert broadcast['result']['MOCK0000'].startswith('error')
+
+
+def test_brightness_must_be_0_to_100(daemon, make_manager, capsys):
+    manager = make_manager()
+
+    for value in ('500', '-1', 'bright'):
+        with pytest.raises(SystemExit):
+            _build_parser().parse_args(['set-brightness', value])
+    assert 'between 0 and 100' in capsys.readouterr().err
+    assert _request(manager, cmd='set-brightness', value=500)['error'] == 'brightness must be between 0 and 100: 500'
+    assert _request(manager, cmd='set-brightness', value=100) == {'result': {'MOCK0000': 'ok', 'MOCK0001': 'ok'}}
+    assert daemon.device('MOCK0000').brightness == 100.0
+
+
+HUNG_CLI = """
+import sys
+from tests.mock_daemon import MockDaemon, install_stand_ins
+install_stand_ins()
+daemon = MockDaemon(devices=2)
+daemon.install()
+
+def scan():  # default factory of RazerManager; MOCK0001 hangs once it has been opened
+    manager = daemon.device_manager()
+    daemon.device('MOCK0001').latency = 5.0
+    return manager
+
+sys.modules['openrazer.client'].DeviceManager = scan
+from razer_control.cli import main
+sys.exit(main(sys.argv[1:]))
+"""
+
+
+def test_cli_exits_at_the_broadcast_deadline_with_a_hung_device():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.monotonic()
+    done = subprocess.run([sys.executable, '-c', HUNG_CLI, 'set-brightness', '30'],
+                          cwd=root, capture_output=True, text=True, timeout=30)
+    elapsed = time.monotonic() - start
+
+    assert 'MOCK0000: ok' in done.stdout and 'MOCK0001: timeout' in done.stdout
+    assert done.returncode == 1
+    assert elapsed < 4.0  # BROADCAST_TIMEOUT plus interpreter startup, not the 5 s hang
@@ -0,0 +1,118 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from razer_control.daemon import _bind
+
+
+@pytest.fixture
+def serve(make_manager):
+    """Run the control daemon for a mock manager on a socket; returns a connected client."""
+    servers, clients = [], []
+
+    def _serve(**kwargs):
+        path = os.path.join(tempfile.mkdtemp(), 'razer.sock')  # short, AF_UNIX paths are limited
+        manager = make_manager(**kwargs)
+        server = _bind(path, manager)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        client = Client(path)
+        client.manager = manager
+        clients.append(client)
+        return client
+
+    yield _serve
+    for client in clients:
+        client.close()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class Client:
+    def __init__(self, path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.sock.settimeout(5)
+        self.reader = self.sock.makefile('rb')
+
+    def send(self, request_id, cmd, **fields):
+        self.sock.sendall((json.dumps({'id': request_id, 'cmd': cmd, **fields}) + '\n').encode())
+
+    def receive(self):
+        return json.loads(self.reader.readline())
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def call(self, cmd, **fields):
+        self.send(1, cmd, **fields)
+        return self.receive()
+
+
+def test_ping_and_list(serve):
+    client = serve()
+
+    assert client.call('ping') == {'id': 1, 'ok': True, 'result': 'pong'}
+    assert [dev['serial'] for dev in client.call('list')['result']] == ['MOCK0000', 'MOCK0001']
+
+
+def test_device_command(daemon, serve):
+    client = serve()
+
+    response = client.call('set-effect', effect='spectrum', device='MOCK0001')
+
+    assert response['result'] == {'MOCK0001': 'ok'}
+    assert daemon.device('MOCK0001').effect == 'spectrum'
+    assert daemon.device('MOCK0000').effect == 'static'
+
+
+def test_bad_requests_keep_the_connection(serve):
+    client = serve()
+
+    client.sock.sendall(b'not json\n')
+    assert client.receive()['ok'] is False
+    assert client.call('reboot')['error'] == 'unknown command: reboot'
+    assert client.call('state', device='NOPE')['error'] == 'unknown device: NOPE'
+    assert client.call('ping')['ok'] is True
+
+
+def test_pipelined_responses_are_matched_by_id(daemon, serve):
+    client = serve()
+    daemon.device('MOCK0000').latency = 0.1
+
+    client.send(1, 'set-brightness', value=10, device='MOCK0000')
+    client.send(2, 'set-brightness', value=20, device='MOCK0001')
+    client.send(3, 'ping')
+    responses = {response['id']: response for response in (client.receive() for _ in range(3))}
+
+    assert sorted(responses) == [1, 2, 3]
+    assert all(response['ok'] for response in responses.values())
+
+
+def test_profile_command_for_a_device_does_not_wait_on_its_own_worker(serve):
+    client = serve()
+    assert client.call('save-profile', name='p', device='MOCK0000')['ok']
+
+    start = time.monotonic()
+    response = client.call('apply-profile', name='p', device='MOCK0000')
+
+    assert response['result'] == {'MOCK0000': 'ok', 'MOCK0001': 'ok'}
+    assert time.monotonic() - start < 1.0
+
+
+
+def test_client_that_does_not_read_does_not_block_the_device(serve):
+    client = serve()
+    requests = ''.join(json.dumps({'id': i, 'cmd': 'state', 'device': 'MOCK0000'}) + '\n' for i in range(10000))
+    client.sock.sendall(requests.encode())  # about 1 MB of replies that nobody reads
+
+    # The worker of MOCK0000 answers all of them and is then free for other callers
+    done = client.manager.executor.submit('MOCK0000', lambda: 'free')
+    assert done.result(timeout=5) == 'free'
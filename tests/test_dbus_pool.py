@@ -0,0 +1,94 @@
+import gc
+
+from razer_control.core.dbus_pool import DBusPool
+from razer_control.core.instrumentation import Instrumentation, TimedInterface
+from tests.mock_daemon import MockDaemon
+
+PATH = '/org/razer/device/MOCK0000'
+
+
+def _pool(daemon, recorder=None):
+    return DBusPool(bus_factory=lambda: daemon.bus, recorder=recorder)
+
+
+def test_one_proxy_per_object_path(daemon):
+    pool = _pool(daemon)
+
+    proxy = pool.get_object('org.razer', PATH)
+
+    assert pool.get_object('org.razer', PATH) is proxy
+    assert pool.get_object('org.razer', '/org/razer/device/MOCK0001') is not proxy
+    assert daemon.bus.get_object_calls == 2
+    assert pool.stats() == {'objects': 2, 'interfaces': 0, 'hits': 1, 'misses': 2}
+
+
+def test_one_interface_per_path_and_interface(daemon):
+    pool = _pool(daemon)
+    proxy = pool.get_object('org.razer', PATH)
+
+    chroma = pool.get_interface(proxy, 'razer.device.lighting.chroma')
+
+    assert pool.get_interface(proxy, 'razer.device.lighting.chroma') is chroma
+    assert pool.get_interface(proxy, 'razer.device.misc') is not chroma
+    # A proxy from outside the pool shares the wrapper of its path
+    assert pool.get_interface(daemon.bus.get_object('org.razer', PATH), 'razer.device.lighting.chroma') is chroma
+    assert pool.stats()['interfaces'] == 2
+
+
+def test_foreign_proxies_are_not_kept_alive(daemon):
+    pool = _pool(daemon)
+
+    for _ in range(3):
+        pool.get_interface(daemon.bus.get_object('org.razer', PATH), 'razer.device.misc')
+        gc.collect()
+
+    assert pool.stats()['interfaces'] == 1
+
+
+def test_release_forgets_one_path(daemon):
+    pool = _pool(daemon)
+    proxy = pool.get_object('org.razer', PATH)
+    iface = pool.get_interface(proxy, 'razer.device.misc')
+    other = pool.get_interface(pool.get_object('org.razer', '/org/razer/device/MOCK0001'), 'razer.device.misc')
+
+    pool.release(PATH)
+
+    assert pool.stats()['objects'] == 1 and pool.stats()['interfaces'] == 1
+    assert pool.get_object('org.razer', PATH) is not proxy
+    assert pool.get_interface(proxy, 'razer.device.misc') is not iface
+    assert pool.get_interface(pool.get_object('org.razer', '/org/razer/device/MOCK0001'), 'razer.device.misc') is other
+
+
+def test_reset_switches_the_bus(daemon):
+    pool = _pool(daemon)
+    pool.get_interface(pool.get_object('org.razer', PATH), 'razer.device.misc')
+    other = MockDaemon(devices=1)
+
+    pool.reset(lambda: other.bus)
+
+    assert pool.stats()['objects'] == 0 and pool.stats()['interfaces'] == 0
+    assert pool.bus is other.bus
+    pool.get_object('org.razer', PATH)
+    assert other.bus.get_object_calls == 1
+
+
+def test_interfaces_are_timed_per_device(daemon):
+    recorder = Instrumentation()
+    pool = _pool(daemon, recorder)
+
+    iface = pool.get_interface(pool.get_object('org.razer', PATH), 'razer.device.lighting.brightness')
+    iface.getBrightness()
+    iface.getBrightness()
+
+    assert isinstance(iface, TimedInterface)
+    methods = recorder.snapshot()['devices']['MOCK0000']['methods']
+    assert methods['dbus.getBrightness']['calls'] == 2
+
+
+def test_untimed_pool_hands_out_plain_interfaces(daemon):
+    pool = _pool(daemon)
+
+    iface = pool.get_interface(pool.get_object('org.razer', PATH), 'razer.device.lighting.brightness')
+
+    assert not isinstance(iface, TimedInterface)
+    assert iface.getBrightness() == 100.0
@@ -0,0 +1,61 @@
+import pytest
+
+
+def _advanced(make_manager):
+    return make_manager().devices.get('MOCK0000').fx.advanced
+
+
+def test_first_draw_sends_every_row(daemon, make_manager):
+    advanced = _advanced(make_manager)
+    advanced.draw()
+
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 1
+    assert sorted(daemon.device('MOCK0000').custom_rows) == list(range(advanced.rows))
+
+
+def test_unchanged_frame_is_not_uploaded(daemon, make_manager):
+    advanced = _advanced(make_manager)
+    advanced.draw()
+    advanced.draw()
+
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 1
+    assert advanced.upload_stats()['skipped_uploads'] == 1
+
+
+def test_only_dirty_rows_are_sent(daemon, make_manager):
+    advanced = _advanced(make_manager)
+    advanced.draw()
+    advanced.matrix[2, 5] = (255, 0, 0)
+    before = advanced.bytes_sent
+    advanced.draw()
+
+    row_size = 3 + advanced.cols * 3
+    assert advanced.bytes_sent - before == row_size
+    row = daemon.device('MOCK0000').custom_rows[2]
+    assert row[3 + 5 * 3:3 + 6 * 3] == bytes((255, 0, 0))
+
+
+def test_restore_forces_a_full_upload(daemon, make_manager):
+    advanced = _advanced(make_manager)
+    advanced.draw()
+    advanced.restore()
+    before = advanced.bytes_sent
+    advanced.draw()
+
+    assert advanced.bytes_sent - before == advanced.matrix.wire_size
+
+
+def test_draw_fb_or_serializes_once(daemon, make_manager, monkeypatch):
+    from razer_control.core.matrix import Frame
+
+    advanced = _advanced(make_manager)
+    advanced.matrix[0, 0] = (255, 0, 0)
+    advanced.matrix.to_framebuffer()
+    advanced.matrix.reset()
+    advanced.matrix[0, 1] = (0, 0, 255)
+    monkeypatch.setattr(Frame, '__bytes__', lambda self: pytest.fail("full serialization"))
+
+    advanced.draw_fb_or()
+
+    assert advanced.matrix[0, 0] == (255, 0, 0) and advanced.matrix[0, 1] == (0, 0, 255)
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 1
@@ -0,0 +1,39 @@
+import threading
+
+from razer_control.core.device_executor import DeviceExecutor, direct_dispatch
+
+
+def test_results_reach_the_callback():
+    executor = DeviceExecutor(direct_dispatch)
+    results = []
+    executor.submit('A', lambda: 42, callback=results.append).result()
+    executor.shutdown(wait=True)
+
+    assert results == [42]
+
+
+def test_cancelled_calls_are_ignored_on_shutdown(caplog):
+    executor = DeviceExecutor(direct_dispatch)
+    release = threading.Event()
+    executor.submit('A', release.wait)
+    queued = executor.submit('A', lambda: None, callback=lambda _: None, error_callback=lambda _: None)
+
+    executor.shutdown(wait=False)
+    release.set()
+
+    assert queued.cancelled()
+    assert not caplog.records
+
+
+def test_drain_waits_for_queued_calls():
+    executor = DeviceExecutor(direct_dispatch)
+    release = threading.Event()
+    done = []
+    executor.submit('A', release.wait)
+    executor.submit('A', lambda: done.append('A'))
+
+    assert not executor.drain(timeout=0.05)
+    release.set()
+    assert executor.drain(timeout=1.0)
+    assert done == ['A']
+    executor.shutdown()
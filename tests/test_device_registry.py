@@ -0,0 +1,48 @@
+from razer_control.core.device_registry import DeviceRegistry
+
+
+def test_add_get_remove():
+    registry = DeviceRegistry()
+    record = registry.add('A', 'Keyboard', None, None)
+
+    assert registry.get('A') is record
+    assert 'A' in registry and len(registry) == 1
+    assert registry.remove('A') is record
+    assert registry.get('A') is None and 'A' not in registry
+    assert registry.remove('A') is None
+
+
+def test_ids_are_stable_per_serial():
+    registry = DeviceRegistry()
+    first = registry.add('A', 'Keyboard', None, None).id
+    second = registry.add('B', 'Mouse', None, None).id
+    registry.remove('A')
+    registry.clear()
+
+    assert registry.add('B', 'Mouse', None, None).id == second
+    assert registry.add('A', 'Keyboard', None, None).id == first
+    assert registry.add('C', 'Headset', None, None).id not in (first, second)
+
+
+def test_select_and_order():
+    registry = DeviceRegistry()
+    for serial in ('A', 'B', 'C'):
+        registry.add(serial, serial, None, None)
+
+    assert registry.serials() == ['A', 'B', 'C']
+    assert [record.serial for record in registry.select()] == ['A', 'B', 'C']
+    assert [record.serial for record in registry.select('B')] == ['B']
+    assert registry.select('X') == []
+    assert registry.first().serial == 'A'
+
+
+def test_iteration_is_a_snapshot():
+    registry = DeviceRegistry()
+    registry.add('A', 'A', None, None)
+    registry.add('B', 'B', None, None)
+
+    seen = []
+    for record in registry:
+        registry.remove(record.serial)  # must not break the loop
+        seen.append(record.serial)
+    assert seen == ['A', 'B'] and len(registry) == 0
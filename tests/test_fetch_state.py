@@ -0,0 +1,46 @@
+import threading
+
+
+def _fetch(manager, serial, count):
+    results = []
+    done = threading.Event()
+
+    def _callback(state):
+        results.append(state)
+        if len(results) == count:
+            done.set()
+
+    for _ in range(count):
+        manager.fetch_state(serial, _callback)
+    assert done.wait(2.0)
+    return results
+
+
+def test_concurrent_fetches_share_one_round_trip(daemon, make_manager):
+    manager = make_manager()
+    daemon.latency = 0.02  # keep the first fetch in flight while the others come in
+    before = daemon.total_calls()
+
+    results = _fetch(manager, 'MOCK0000', 3)
+
+    assert daemon.total_calls() - before == 4  # effect, colors, brightness, name
+    assert len(results) == 3 and all(state == results[0] for state in results)
+    assert results[0] is not results[1]  # every caller gets its own copy
+
+
+def test_fetch_after_reply_is_served_from_cache(daemon, make_manager):
+    manager = make_manager()
+    _fetch(manager, 'MOCK0000', 1)
+    before = daemon.total_calls()
+
+    assert _fetch(manager, 'MOCK0000', 1)[0]['effect'] == 'static'
+    assert daemon.total_calls() == before
+
+
+def test_failed_fetch_answers_every_waiter(daemon, make_manager):
+    manager = make_manager()
+    daemon.latency = 0.02
+    daemon.failing.add('getBrightness')
+
+    assert _fetch(manager, 'MOCK0000', 3) == [None, None, None]
+    assert manager._pending_fetches == {}
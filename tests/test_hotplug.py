@@ -0,0 +1,88 @@
+from tests.conftest import wait_for
+
+
+def test_added_device_is_picked_up(daemon, make_manager):
+    manager = make_manager(watch_hotplug=True)
+    changes = []
+    manager.connect_devices_changed(lambda added, removed: changes.append((added, removed)))
+
+    daemon.add_device(serial='NEW0001')
+
+    assert wait_for(lambda: 'NEW0001' in manager.devices)
+    added, removed = changes[0]
+    assert [record.serial for record in added] == ['NEW0001'] and removed == []
+    assert manager.devices.serials() == ['MOCK0000', 'MOCK0001', 'NEW0001']
+
+
+def test_removed_device_is_dropped(daemon, make_manager):
+    manager = make_manager(watch_hotplug=True)
+    changes = []
+    manager.connect_devices_changed(lambda added, removed: changes.append((added, removed)))
+
+    daemon.remove_device('MOCK0000')
+
+    assert wait_for(lambda: 'MOCK0000' not in manager.devices)
+    added, removed = changes[0]
+    assert added == [] and [record.serial for record in removed] == ['MOCK0000']
+    assert manager.devices.serials() == ['MOCK0001']
+
+
+def test_diff_only_opens_new_devices(daemon, make_manager):
+    manager = make_manager()
+    daemon.add_device(serial='NEW0001', notify=False)
+    daemon.remove_device('MOCK0001', notify=False)
+
+    added, removed = manager._diff_devices()
+
+    assert [device.serial for device, fx in added] == ['NEW0001']
+    assert removed == ['MOCK0001']
+
+
+def test_replugged_device_keeps_its_id(daemon, make_manager):
+    manager = make_manager(watch_hotplug=True)
+    device_id = manager.devices.get('MOCK0001').id
+
+    daemon.remove_device('MOCK0001')
+    assert wait_for(lambda: 'MOCK0001' not in manager.devices)
+    daemon.add_device(serial='MOCK0001')
+    assert wait_for(lambda: 'MOCK0001' in manager.devices)
+
+    assert manager.devices.get('MOCK0001').id == device_id
+
+
+def test_unplugged_device_releases_its_worker(daemon, make_manager):
+    manager = make_manager(watch_hotplug=True)
+    manager.set_effect_async('static', 255, 0, 0, device_serial='MOCK0001').result()
+    assert 'MOCK0001' in manager.executor._workers
+
+    for _ in range(3):
+        daemon.remove_device('MOCK0001')
+        assert wait_for(lambda: 'MOCK0001' not in manager.devices)
+        assert 'MOCK0001' not in manager.executor._workers
+        daemon.add_device(serial='MOCK0001')
+        assert wait_for(lambda: 'MOCK0001' in manager.devices)
+
+    assert manager.set_effect_async('static', 0, 0, 255, device_serial='MOCK0001').result() == {'MOCK0001': 'ok'}
+
+
+def test_hotplug_does_not_reopen_known_devices(daemon, make_manager):
+    manager = make_manager(watch_hotplug=True)
+    before = daemon.calls.copy()
+
+    daemon.add_device(serial='NEW0001')
+    assert wait_for(lambda: 'NEW0001' in manager.devices)
+
+    new_calls = daemon.calls - before
+    assert {serial for serial, member in new_calls} == {'daemon', 'NEW0001'}
+    assert new_calls[('daemon', 'getDevices')] == 1
+
+
+def test_device_that_cannot_be_opened_is_retried(daemon, make_manager):
+    manager = make_manager()
+    daemon.add_device(serial='NEW0001', notify=False)
+    daemon.failing.add(('NEW0001', 'getDeviceType'))
+
+    assert manager._diff_devices() == ([], [])
+
+    daemon.failing.clear()
+    assert [device.serial for device, fx in manager._diff_devices()[0]] == ['NEW0001']
@@ -0,0 +1,96 @@
+import pytest
+
+from razer_control.core.instrumentation import Instrumentation, MethodStats, TimedInterface
+
+
+def _stats(*samples_ms):
+    stats = MethodStats()
+    for ms in samples_ms:
+        stats.record(ms / 1000)
+    return stats
+
+
+def test_percentiles_are_bucket_upper_bounds():
+    stats = _stats(*[0.2] * 90, *[40] * 10)
+
+    assert stats.percentile(50) == 0.25
+    assert stats.percentile(90) == 0.25
+    assert stats.percentile(95) == 40  # bucket <=50, capped at the slowest call
+    assert stats.percentile(100) == 40
+
+
+def test_percentile_of_the_overflow_bucket_is_the_max():
+    stats = _stats(1, 1, 3000)
+
+    assert stats.percentile(50) == 1
+    assert stats.percentile(99) == 3000
+
+
+def test_empty_stats():
+    assert MethodStats().percentile(95) == 0.0
+    assert MethodStats().to_dict()['avg_ms'] == 0.0
+
+
+def test_to_dict():
+    stats = _stats(0.05, 2, 2)
+    stats.record(0.007, error=True)
+
+    assert stats.to_dict() == {
+        'calls': 4, 'errors': 1, 'avg_ms': 2.763, 'p50_ms': 2.5, 'p95_ms': 7.0, 'max_ms': 7.0,
+        'histogram_ms': {'<=0.1': 1, '<=2.5': 2, '<=10': 1},
+    }
+
+
+class FakeInterface:
+    def getBrightness(self):
+        return 42
+
+    def setBrightness(self, value):
+        raise RuntimeError("unplugged")
+
+    def getEffect(self, reply_handler=None, error_handler=None):
+        self.reply, self.error = reply_handler, error_handler
+
+
+def _methods(recorder):
+    return recorder.snapshot()['devices']['MOCK0000']['methods']
+
+
+def test_each_method_is_recorded_under_its_name():
+    recorder = Instrumentation()
+    iface = TimedInterface(FakeInterface(), 'MOCK0000', recorder)
+
+    assert iface.getBrightness() == 42
+    iface.getBrightness()
+    with pytest.raises(RuntimeError):
+        iface.setBrightness(10)
+
+    methods = _methods(recorder)
+    assert methods['dbus.getBrightness']['calls'] == 2 and methods['dbus.getBrightness']['errors'] == 0
+    assert methods['dbus.setBrightness']['calls'] == 1 and methods['dbus.setBrightness']['errors'] == 1
+
+
+def test_async_calls_are_recorded_when_the_reply_arrives():
+    recorder = Instrumentation()
+    fake = FakeInterface()
+    iface = TimedInterface(fake, 'MOCK0000', recorder)
+    replies, errors = [], []
+
+    iface.getEffect(reply_handler=replies.append, error_handler=errors.append)
+    assert recorder.snapshot()['devices'] == {}
+
+    fake.reply('static')
+    iface.getEffect(reply_handler=replies.append, error_handler=errors.append)
+    fake.error(RuntimeError("timeout"))
+
+    assert replies == ['static'] and len(errors) == 1
+    assert _methods(recorder)['dbus.getEffect']['calls'] == 2
+    assert _methods(recorder)['dbus.getEffect']['errors'] == 1
+
+
+def test_disabled_recorder_records_nothing():
+    recorder = Instrumentation()
+    recorder.enabled = False
+    TimedInterface(FakeInterface(), 'MOCK0000', recorder).getBrightness()
+
+    assert recorder.snapshot()['devices'] == {}
@@ -0,0 +1,81 @@
+import numpy as np
+
+from razer_control.core import kernels
+from razer_control.core.matrix import Frame
+
+
+def _frame(rows=2, cols=5):
+    return Frame((rows, cols))
+
+
+def test_fill():
+    frame = _frame()
+    kernels.fill(frame, (1, 2, 3))
+    assert {frame.get(y, x) for y in range(2) for x in range(5)} == {(1, 2, 3)}
+
+
+def test_gradient_runs_from_start_to_end():
+    frame = _frame()
+    kernels.gradient(frame, (0, 0, 0), (200, 100, 0))
+    assert frame.get(0, 0) == (0, 0, 0)
+    assert frame.get(1, 2) == (100, 50, 0)
+    assert frame.get(0, 4) == (200, 100, 0)
+
+
+def test_vertical_gradient():
+    frame = _frame(rows=3)
+    kernels.gradient(frame, (0, 0, 0), (0, 0, 200), horizontal=False)
+    assert [frame.get(y, 1) for y in range(3)] == [(0, 0, 0), (0, 0, 100), (0, 0, 200)]
+
+
+def test_wave_moves_with_time():
+    frame = _frame(cols=8)
+    kernels.wave(frame, 0.0, (200, 0, 0), wavelength=8.0)
+    assert frame.get(0, 0) == (100, 0, 0)
+    assert frame.get(0, 2) == (200, 0, 0)
+    assert frame.get(0, 6) == (0, 0, 0)
+
+    kernels.wave(frame, 0.25, (200, 0, 0), wavelength=8.0)
+    assert frame.get(0, 4) == (200, 0, 0)
+
+
+def test_ripple_lights_a_ring():
+    frame = _frame(rows=5, cols=5)
+    kernels.ripple(frame, 0.2, (2, 2), (0, 255, 0), speed=10.0, width=1.0)
+    assert frame.get(2, 2) == (0, 0, 0)
+    assert frame.get(0, 2) == (0, 255, 0)
+    assert frame.get(2, 4) == (0, 255, 0)
+
+
+def test_starlight_is_reproducible_and_fades():
+    a, b = _frame(), _frame()
+    kernels.starlight(a, (255, 255, 255), density=0.5, rng=np.random.default_rng(1))
+    kernels.starlight(b, (255, 255, 255), density=0.5, rng=np.random.default_rng(1))
+    assert bytes(a) == bytes(b)
+    assert 0 < np.count_nonzero(a._matrix[0]) < 10
+
+    kernels.starlight(a, (255, 255, 255), density=0.0, decay=0.5)
+    assert set(np.unique(a._matrix)) <= {0, 127}
+
+
+def test_fade():
+    frame = _frame()
+    kernels.fill(frame, (200, 100, 10))
+    kernels.fade(frame, 0.5)
+    assert frame.get(1, 1) == (100, 50, 5)
+
+
+def test_hue_rotate():
+    frame = _frame()
+    kernels.fill(frame, (255, 0, 0))
+    kernels.hue_rotate(frame, 120)
+    assert frame.get(0, 0) == (0, 255, 0)
+    kernels.hue_rotate(frame, 120)
+    assert frame.get(0, 0) == (0, 0, 255)
+
+
+def test_hue_rotate_keeps_greys():
+    frame = _frame()
+    kernels.fill(frame, (80, 80, 80))
+    kernels.hue_rotate(frame, 90)
+    assert frame.get(0, 0) == (80, 80, 80)
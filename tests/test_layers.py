@@ -0,0 +1,76 @@
+import pytest
+
+from razer_control.core.layers import LayerStack
+from razer_control.core.matrix import Frame
+
+
+def _stack(*layers):
+    """LayerStack on a 2x3 frame; every layer is (blend, opacity, fill color)."""
+    stack = LayerStack(Frame((2, 3)))
+    for i, (blend, opacity, rgb) in enumerate(layers):
+        layer = stack.add_layer(f"layer{i}", blend, opacity)
+        for y in range(2):
+            for x in range(3):
+                layer.frame.set(y, x, rgb)
+    return stack
+
+
+def test_over_replaces():
+    stack = _stack(('over', 1.0, (10, 20, 30)), ('over', 1.0, (200, 100, 50)))
+    assert stack.composite().get(0, 0) == (200, 100, 50)
+
+
+def test_over_with_opacity_mixes():
+    stack = _stack(('over', 1.0, (0, 0, 0)), ('over', 0.5, (200, 100, 50)))
+    assert stack.composite().get(1, 2) == (100, 50, 25)
+
+
+def test_add_saturates():
+    stack = _stack(('over', 1.0, (200, 10, 0)), ('add', 1.0, (100, 10, 0)))
+    assert stack.composite().get(0, 0) == (255, 20, 0)
+
+
+def test_max_keeps_the_brighter_channel():
+    stack = _stack(('over', 1.0, (200, 10, 0)), ('max', 1.0, (100, 50, 0)))
+    assert stack.composite().get(0, 0) == (200, 50, 0)
+
+
+def test_multiply_darkens():
+    stack = _stack(('over', 1.0, (200, 255, 100)), ('multiply', 1.0, (255, 0, 51)))
+    assert stack.composite().get(0, 0) == (200, 0, 20)
+
+
+def test_alpha_is_per_key():
+    stack = _stack(('over', 1.0, (0, 0, 0)), ('alpha', 1.0, (200, 200, 200)))
+    stack.layer('layer1').alpha[0, 0] = 0.25
+    frame = stack.composite()
+    assert frame.get(0, 0) == (50, 50, 50)
+    assert frame.get(0, 1) == (200, 200, 200)
+
+
+def test_mask_limits_the_layer():
+    stack = _stack(('over', 1.0, (10, 10, 10)), ('over', 1.0, (200, 0, 0)))
+    stack.layer('layer1').mask[...] = 0
+    stack.layer('layer1').mask[1, 1] = 1
+    frame = stack.composite()
+    assert frame.get(1, 1) == (200, 0, 0)
+    assert frame.get(0, 0) == (10, 10, 10)
+
+
+def test_hidden_and_transparent_layers_are_skipped():
+    stack = _stack(('over', 1.0, (10, 10, 10)), ('over', 0.0, (200, 0, 0)), ('over', 1.0, (0, 200, 0)))
+    stack.layer('layer2').visible = False
+    assert stack.composite().get(0, 0) == (10, 10, 10)
+
+
+def test_saturated_layers_are_clipped_before_the_next_blend():
+    stack = _stack(('over', 1.0, (200, 200, 200)), ('add', 1.0, (200, 200, 200)), ('over', 0.5, (0, 0, 0)))
+    assert stack.composite().get(0, 0) == (127, 127, 127)
+
+
+def test_layer_names_and_blend_modes_are_validated():
+    stack = _stack(('over', 1.0, (0, 0, 0)))
+    with pytest.raises(ValueError):
+        stack.add_layer('layer0')
+    with pytest.raises(ValueError):
+        stack.add_layer('top', blend='screen')
@@ -0,0 +1,33 @@
+from razer_control.core.dbus_pool import dbus_pool
+from razer_control.core.fx import SingleLed
+
+
+def test_zones_are_built_on_first_access(daemon, make_manager):
+    fx = make_manager().devices.get('MOCK0000').fx
+    calls, interfaces = daemon.total_calls(), dbus_pool.stats()['interfaces']
+
+    misc = fx.misc
+
+    assert misc._zones == {}
+    assert daemon.total_calls() == calls
+    assert dbus_pool.stats()['interfaces'] == interfaces
+
+    logo = misc.logo
+    assert isinstance(logo, SingleLed)
+    assert dbus_pool.stats()['interfaces'] == interfaces + 1
+    assert daemon.total_calls() == calls
+
+
+def test_zones_are_cached(daemon, make_manager):
+    fx = make_manager().devices.get('MOCK0000').fx
+    logo = fx.misc.logo
+    interfaces = dbus_pool.stats()['interfaces']
+
+    assert fx.misc.logo is logo
+    assert fx.misc.scroll_wheel is None  # no lighting_scroll capability
+    assert fx.misc.scroll_wheel is None
+    assert dbus_pool.stats()['interfaces'] == interfaces
+    assert list(fx.misc._zones) == ['logo', 'scroll']
+
+    assert logo.static(1, 2, 3)
+    assert daemon.device('MOCK0000').zones['LogoStatic'] == {'value': (1, 2, 3)}
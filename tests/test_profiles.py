@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from razer_control.core.profiles import ProfileStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / 'razer-control' / 'profiles.json'))
+
+
+def test_save_and_load(store):
+    store.save('red', {'A': {'effect': 'static', 'r': 255, 'g': 0, 'b': 0, 'brightness': 50, 'name': 'x'}, 'B': None})
+
+    assert store.load('red') == {'A': {'effect': 'static', 'r': 255, 'g': 0, 'b': 0, 'brightness': 50}}
+    assert store.names() == ['red'] and store.load('blue') is None
+
+
+def test_save_is_atomic(store, monkeypatch):
+    store.save('red', {'A': {'effect': 'static'}})
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', crash)
+    with pytest.raises(OSError):
+        store.save('blue', {'A': {'effect': 'spectrum'}})
+
+    assert store.names() == ['red']
+    assert os.listdir(os.path.dirname(store.path)) == ['profiles.json']
+
+
+def test_unreadable_file_counts_as_empty(store, caplog):
+    os.makedirs(os.path.dirname(store.path))
+    with open(store.path, 'w', encoding='utf-8') as f:
+        f.write('{"profiles": ')
+
+    assert store.load('red') is None
+    assert 'Could not read profiles' in caplog.text
+
+
+def test_unreadable_device_keeps_its_previous_entry(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0)
+    manager.save_profile('p')
+
+    manager.set_effect('static', 0, 0, 255)
+    manager.invalidate_state()
+    daemon.failing.add(('MOCK0001', 'getEffect'))
+    manager.save_profile('p')
+
+    profile = manager.profiles.load('p')
+    assert (profile['MOCK0000']['r'], profile['MOCK0000']['b']) == (0, 255)
+    assert (profile['MOCK0001']['r'], profile['MOCK0001']['b']) == (255, 0)
+
+
+def test_unreadable_device_is_not_invented(daemon, make_manager):
+    manager = make_manager()
+    daemon.failing.add(('MOCK0001', 'getEffect'))
+    manager.save_profile('new')
+
+    assert list(manager.profiles.load('new')) == ['MOCK0000']
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def advanced(make_manager):
+    advanced = make_manager().devices.get('MOCK0000').fx.advanced
+    advanced.draw()  # first full upload out of the way
+    return advanced
+
+
+def test_many_keys_are_one_upload(daemon, advanced):
+    advanced.set_keys([(0, 0, (255, 0, 0)), (1, 3, (0, 255, 0)), (5, 21, (0, 0, 255))])
+
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 2
+    assert daemon.calls[('MOCK0000', 'setCustom')] == 2
+    assert daemon.calls[('MOCK0000', 'setKey')] == 0
+    assert advanced.matrix[1, 3] == (0, 255, 0) and advanced.matrix[5, 21] == (0, 0, 255)
+    assert advanced.bytes_sent - advanced.matrix.wire_size == 3 * (3 + advanced.cols * 3)
+
+
+def test_array_form_and_clipping(advanced):
+    advanced.set_keys(np.array([[2, 2], [3, 3]]), np.array([[300, -5, 10], [1, 2, 3]]))
+
+    assert advanced.matrix[2, 2] == (255, 0, 10) and advanced.matrix[3, 3] == (1, 2, 3)
+
+
+def test_no_keys_no_upload(daemon, advanced):
+    advanced.set_keys([])
+    advanced.set_keys(np.empty((0, 2)), np.empty((0, 3), dtype=int))
+
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 1
+
+
+@pytest.mark.parametrize('keys, colors', [
+    ([(6, 0, (1, 2, 3))], None),            # row out of bounds
+    ([(0, -1, (1, 2, 3))], None),           # negative column
+    ([(0, 0)], None),                       # no color
+    ([(0, 0, (1, 2))], None),               # two components
+    ([[0, 0]], [[1.5, 2, 3]]),              # float color
+    ([[0, 0], [1, 1]], [[1, 2, 3]]),        # fewer colors than keys
+])
+def test_invalid_keys_raise_and_upload_nothing(daemon, advanced, keys, colors):
+    with pytest.raises(ValueError):
+        advanced.set_keys(keys, None if colors is None else np.array(colors))
+
+    assert daemon.calls[('MOCK0000', 'setKeyRow')] == 1
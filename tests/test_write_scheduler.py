@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from tests.conftest import wait_for
+from razer_control.core.write_scheduler import WriteScheduler
+
+
+class Recorder:
+    def __init__(self):
+        self.values = []
+        self.times = []
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.values.append(value)
+            self.times.append(time.monotonic())
+
+
+def test_final_value_is_delivered():
+    scheduler = WriteScheduler(max_rate=20.0)
+    write = Recorder()
+    for value in range(50):
+        scheduler.submit('A', 'brightness', value, write)
+
+    assert wait_for(lambda: scheduler.stats()['pending'] == 0)
+    assert write.values[0] == 0 and write.values[-1] == 49
+    assert len(write.values) <= 3
+
+
+def test_writes_are_rate_limited():
+    scheduler = WriteScheduler(max_rate=20.0)
+    write = Recorder()
+    for value in range(5):
+        scheduler.submit('A', 'brightness', value, write)
+        assert wait_for(lambda: scheduler.stats()['pending'] == 0)
+
+    gaps = [b - a for a, b in zip(write.times, write.times[1:])]
+    assert write.values == [0, 1, 2, 3, 4]
+    assert min(gaps) >= scheduler.min_interval * 0.9
+
+
+def test_properties_and_devices_are_independent():
+    scheduler = WriteScheduler(max_rate=1.0)
+    write = Recorder()
+    scheduler.submit('A', 'brightness', 1, write)
+    scheduler.submit('B', 'brightness', 2, write)
+    scheduler.submit('A', 'effect', 3, write)
+
+    assert sorted(write.values) == [1, 2, 3]
+
+
+def test_counters():
+    scheduler = WriteScheduler(max_rate=1.0)
+    write = Recorder()
+    for value in range(4):
+        scheduler.submit('A', 'brightness', value, write)
+
+    assert scheduler.stats() == {'submitted': 4, 'written': 1, 'coalesced': 2, 'pending': 1}
+    scheduler.flush()
+    assert scheduler.stats() == {'submitted': 4, 'written': 2, 'coalesced': 2, 'pending': 0}
+    assert write.values == [0, 3]
+
+
+def test_failed_write_is_logged(caplog):
+    scheduler = WriteScheduler()
+
+    def fail(value):
+        raise RuntimeError("unplugged")
+
+    scheduler.submit('A', 'brightness', 1, fail)
+    assert 'unplugged' in caplog.text
+
+
+def test_slow_device_gets_one_write_at_a_time(daemon, make_manager):
+    daemon.method_latency['setBrightness'] = 0.2
+    manager = make_manager()
+
+    start = time.monotonic()
+    value = 0
+    while time.monotonic() - start < 0.5:  # slider drag at ~60 Hz
+        value += 1
+        manager.schedule_brightness(value, device_serial='MOCK0000')
+        time.sleep(1 / 60)
+    dragged = time.monotonic()
+
+    assert wait_for(lambda: daemon.device('MOCK0000').brightness == value)
+    assert time.monotonic() - dragged < 0.5
+    assert daemon.calls[('MOCK0000', 'setBrightness')] <= 5
+
+
+def test_value_waits_for_the_write_in_flight():
+    scheduler = WriteScheduler(max_rate=1000.0)
+    write = Recorder()
+    running = Future()
+    scheduler.submit('A', 'brightness', 1, lambda v: (write(v), running)[1])
+    time.sleep(0.01)
+    scheduler.submit('A', 'brightness', 2, write)
+    scheduler.submit('A', 'brightness', 3, write)
+    time.sleep(0.01)
+    assert write.values == [1]
+
+    running.set_result(None)
+    assert wait_for(lambda: write.values == [1, 3])
@@ -0,0 +1,95 @@
+from razer_control.core.instrumentation import instrumentation
+
+
+def _counters(serial):
+    return instrumentation.snapshot()['devices'].get(serial, {}).get('counters', {})
+
+
+def test_identical_effect_write_is_dropped(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 1
+    assert _counters('MOCK0000')['writes.dropped.effect'] == 1
+
+
+def test_changed_color_is_written(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+    manager.set_effect('static', 0, 0, 255, device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 2
+    assert daemon.device('MOCK0000').colors[:3] == [0, 0, 255]
+
+
+def test_color_is_ignored_for_effects_without_color(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('spectrum', 1, 2, 3, device_serial='MOCK0000')
+    manager.set_effect('spectrum', 4, 5, 6, device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setSpectrum')] == 1
+
+
+def test_brightness_dedup_per_device(daemon, make_manager):
+    manager = make_manager()
+    manager.set_brightness(40)
+    manager.set_brightness(40)
+
+    for serial in ('MOCK0000', 'MOCK0001'):
+        assert daemon.calls[(serial, 'setBrightness')] == 1
+        assert _counters(serial)['writes.dropped.brightness'] == 1
+
+
+def test_invalidate_state_forgets_writes(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+    manager.invalidate_state('MOCK0000')
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 2
+
+
+def test_repeat_after_the_window_is_written(daemon, make_manager, monkeypatch):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+    monkeypatch.setattr(manager, 'WRITE_DEDUP_WINDOW', 0.0)
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 2
+
+
+def test_force_skips_dedup(daemon, make_manager):
+    manager = make_manager()
+    manager.set_brightness(40, device_serial='MOCK0000')
+    manager.set_brightness(40, device_serial='MOCK0000', force=True)
+
+    assert daemon.calls[('MOCK0000', 'setBrightness')] == 2
+
+
+def test_hardware_read_does_not_suppress_writes(daemon, make_manager):
+    manager = make_manager()
+    state = manager.get_current_state('MOCK0000')
+    manager.set_effect(state['effect'], state['r'], state['g'], state['b'], device_serial='MOCK0000')
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 1
+
+
+def test_apply_profile_overrides_external_changes(daemon, make_manager):
+    manager = make_manager()
+    manager.set_effect('static', 255, 0, 0, device_serial='MOCK0000')
+    manager.save_profile('red')
+    daemon.device('MOCK0000').colors[:3] = [0, 0, 255]  # changed by another tool
+
+    manager.apply_profile('red')
+
+    assert daemon.device('MOCK0000').colors[:3] == [255, 0, 0]
+
+
+def test_clicking_the_same_preset_twice_writes_once(daemon, make_manager):
+    """What ColorsGroup does on a preset click: set_effect_async with the current effect."""
+    manager = make_manager()
+    for _ in range(2):
+        manager.set_effect_async('static', 255, 0, 0, device_serial='MOCK0000').result()
+
+    assert daemon.calls[('MOCK0000', 'setStatic')] == 1